@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import itertools
+import os
+import re
+import shlex
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from generate_vehicles import S3Config, s3_client
+
+
+# -----------------------------
+# Layout grid
+# -----------------------------
+BENCHES = (
+    "bench_count_records.sql",
+    "bench_stay_duration.sql",
+    "bench_frequent_crossers.sql",
+    "bench_partition_country_counts.sql",
+    "bench_ts_quantiles.sql",
+    "bench_vehicle_history_lookup.sql",
+    "bench_time_window_count.sql",
+)
+DATASET_URL = "s3://lake/vehicles/"  # the dataset the bench files read, swapped for each setting's copy
+
+
+@dataclass(frozen=True)
+class LayoutSetting:
+    """One point of the grid; None keeps the generator's default for that knob."""
+
+    row_group_rows: int
+    file_mb: Optional[float]
+    page_kb: Optional[int]
+
+    @property
+    def name(self) -> str:
+        file_mb = "part" if self.file_mb is None else f"{self.file_mb:g}mb"
+        page_kb = "default" if self.page_kb is None else f"{self.page_kb}kb"
+        return f"rg{self.row_group_rows}_file{file_mb}_page{page_kb}"
+
+    def generator_args(self) -> List[str]:
+        args = ["--row-group-rows", str(self.row_group_rows)]
+        if self.file_mb is not None:
+            args += ["--target-file-mb", f"{self.file_mb:g}"]
+        if self.page_kb is not None:
+            args += ["--data-page-kb", str(self.page_kb)]
+        return args
+
+
+def grid_values(kind: Callable[[str], object], default_ok: bool = True) -> Callable[[str], list]:
+    """argparse type for a comma-separated list of grid values; "default" keeps the generator default."""
+    expected = "comma-separated positive numbers" + (" or 'default'" if default_ok else "")
+
+    def parse(text: str) -> list:
+        try:
+            values = [
+                None if default_ok and v.strip() == "default" else kind(v.strip()) for v in text.split(",") if v.strip()
+            ]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"expected {expected}, got {text!r}")
+        if not values or any(v is not None and v <= 0 for v in values):
+            raise argparse.ArgumentTypeError(f"expected {expected}, got {text!r}")
+        return values
+
+    return parse
+
+
+# -----------------------------
+# Sample dataset per setting (S3)
+# -----------------------------
+def dataset_objects(s3, bucket: str, prefix: str) -> Tuple[int, int]:
+    """(files, bytes) of the parquet objects under prefix."""
+    files = nbytes = 0
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix + "/"):
+        for obj in page.get("Contents", []):
+            if obj["Key"].endswith(".parquet"):
+                files += 1
+                nbytes += obj["Size"]
+    return files, nbytes
+
+
+def delete_prefix(s3, bucket: str, prefix: str):
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix + "/"):
+        keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+        if keys:
+            s3.delete_objects(Bucket=bucket, Delete={"Objects": keys})
+
+
+def build_dataset(args, setting: LayoutSetting, prefix: str, extra: List[str]):
+    """Regenerate the fixed sample (same seed and days for every setting) with this setting's layout."""
+    cmd = [
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "generate_vehicles.py"),
+        "--days", str(args.days),
+        "--start-date", args.start_date,
+        "--avg-in-per-day", str(args.avg_in_per_day),
+        "--avg-out-per-day", str(args.avg_out_per_day),
+        "--seed", str(args.seed),
+        "--arrow",
+        "--sink", "s3",
+        "--s3-endpoint", args.s3_endpoint,
+        "--s3-access", args.s3_access,
+        "--s3-secret", args.s3_secret,
+        "--s3-bucket", args.s3_bucket,
+        "--s3-prefix", prefix,
+    ] + setting.generator_args() + extra
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+
+
+# -----------------------------
+# Bench scripts for the DuckDB CLI
+# -----------------------------
+CASE_RE = re.compile(r"'([^']+)'\s+AS\s+case_src", re.IGNORECASE)
+RUN_TIME_RE = re.compile(r"Run Time \(s\): real ([0-9.]+)")
+STATS_MARKER = "@@stats"
+
+
+def bench_statements(path: str) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Split a bench file into setup statements (params, views) and its S3 cases as (case_src, statement).
+    Comments, dot commands, info selects, the file's own logging and the Postgres cases are dropped.
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if not line.lstrip().startswith(("--", "."))]
+    setup, cases = [], []
+    for statement in "".join(lines).split(";"):
+        statement = statement.strip()
+        if not statement or re.search(r"\bAS\s+info\b", statement, re.IGNORECASE):
+            continue
+        if statement.upper().startswith("CALL ") or "duckdb_logs" in statement:
+            continue
+        case = CASE_RE.search(statement)
+        if case is None:
+            setup.append(statement)
+        elif case.group(1).endswith(".S3"):
+            cases.append((case.group(1), statement))
+    return setup, cases
+
+
+def bench_script(bootstrap: str, setup: List[str], cases: List[Tuple[str, str]], repeat: int) -> str:
+    """
+    DuckDB CLI script: time each case with .timer and count its S3 requests from the HTTP log,
+    which is cleared before every run; the external file cache is off so every run reads from S3.
+    """
+    out = [
+        f".read {bootstrap}",
+        "SET enable_external_file_cache = false;",
+        ".mode csv",
+        ".headers off",
+        "CALL enable_logging('HTTP');",
+    ]
+    out += [s + ";" for s in setup]
+    for label, statement in cases:
+        for _ in range(repeat):
+            out += [
+                "CALL truncate_duckdb_logs();",
+                ".timer on",
+                statement + ";",
+                ".timer off",
+                f"SELECT '{STATS_MARKER}', '{label}', "
+                "count(*) FILTER (WHERE request.type = 'GET'), "
+                "coalesce(sum(TRY_CAST(response.headers['Content-Length'] AS BIGINT)) "
+                "FILTER (WHERE request.type = 'GET'), 0) "
+                "FROM duckdb_logs_parsed('HTTP');",
+            ]
+    return "\n".join(out) + "\n"
+
+
+def parse_runs(stdout: str) -> Dict[str, List[Tuple[float, int, int]]]:
+    """(seconds, GETs, bytes) per run of every case, from the CLI's csv output and timer lines."""
+    runs: Dict[str, List[Tuple[float, int, int]]] = {}
+    seconds = None
+    for line in stdout.splitlines():
+        timed = RUN_TIME_RE.search(line)
+        if timed:
+            seconds = float(timed.group(1))
+        elif line.startswith(STATS_MARKER + ","):
+            _, label, gets, nbytes = next(csv.reader([line]))
+            if seconds is not None:
+                runs.setdefault(label, []).append((seconds, int(gets), int(nbytes)))
+            seconds = None
+    return runs
+
+
+def run_bench(cmd: List[str], script: str) -> Tuple[Dict[str, List[Tuple[float, int, int]]], str]:
+    proc = subprocess.run(cmd, input=script, capture_output=True, text=True, encoding="utf-8")
+    return parse_runs(proc.stdout), proc.stderr.strip()
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Rebuild a fixed sample dataset for a grid of Parquet layouts and rerun the DuckDB benches on each",
+        epilog="arguments not listed here are passed on to generate_vehicles.py (e.g. --chunk-rows 500000)",
+    )
+    ap.add_argument(
+        "--row-group-rows",
+        type=grid_values(int, default_ok=False),
+        default=[50_000, 250_000],
+        metavar="N[,N...]",
+        help="rows per row group to try (default: 50000,250000)",
+    )
+    ap.add_argument(
+        "--target-file-mb",
+        type=grid_values(float),
+        default=[None],
+        metavar="MB[,MB...]",
+        help="target file sizes to try; 'default' is one file per --chunk-rows part (default: default)",
+    )
+    ap.add_argument(
+        "--data-page-kb",
+        type=grid_values(int),
+        default=[None, 64],
+        metavar="KB[,KB...]",
+        help="data page sizes to try; 'default' is Arrow's 1024 (default: default,64)",
+    )
+    ap.add_argument("--days", type=int, default=7, help="days in the sample dataset")
+    ap.add_argument("--start-date", type=str, default="2025-01-01", help="YYYY-MM-DD (UTC)")
+    ap.add_argument("--avg-in-per-day", type=int, default=1_100_000)
+    ap.add_argument("--avg-out-per-day", type=int, default=1_100_000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--s3-endpoint", type=str, default="http://localhost:9000")
+    ap.add_argument("--s3-access", type=str, default="minio")
+    ap.add_argument("--s3-secret", type=str, default="minio12345")
+    ap.add_argument("--s3-bucket", type=str, default="lake")
+    ap.add_argument("--s3-prefix", type=str, default="bench_layouts", help="one dataset per setting below this prefix")
+    ap.add_argument("--reuse", action="store_true", help="skip rebuilding settings whose dataset already exists")
+    ap.add_argument(
+        "--bench",
+        nargs="+",
+        default=list(BENCHES),
+        help="bench files under duckdb/ (only their S3 cases run)",
+    )
+    ap.add_argument("--repeat", type=int, default=3, help="runs per case; the median latency is reported")
+    ap.add_argument(
+        "--duckdb-cmd",
+        type=str,
+        default="docker exec -i evo1-duckdb duckdb /data/duckdb.db",
+        help="DuckDB CLI that reads a script from stdin",
+    )
+    ap.add_argument("--bootstrap", type=str, default="/data/bootstrap.sql", help="path of bootstrap.sql for the CLI")
+    ap.add_argument("--csv", type=str, default=None, help="also write the results to this CSV file")
+
+    args, extra = ap.parse_known_args()
+    if args.repeat <= 0:
+        ap.error("--repeat must be > 0")
+
+    bench_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "duckdb")
+    benches = {name: bench_statements(os.path.join(bench_dir, name)) for name in args.bench}
+    settings = [
+        LayoutSetting(rows, file_mb, page_kb)
+        for rows, file_mb, page_kb in itertools.product(args.row_group_rows, args.target_file_mb, args.data_page_kb)
+    ]
+    cfg = S3Config(
+        endpoint=args.s3_endpoint,
+        access_key=args.s3_access,
+        secret_key=args.s3_secret,
+        bucket=args.s3_bucket,
+        prefix=args.s3_prefix.rstrip("/"),
+    )
+    s3 = s3_client(cfg)
+    cmd = shlex.split(args.duckdb_cmd)
+
+    results = []
+    for setting in settings:
+        prefix = f"{cfg.prefix}/{setting.name}"
+        if not (args.reuse and dataset_objects(s3, cfg.bucket, prefix)[0]):
+            print(f"{setting.name}: building s3://{cfg.bucket}/{prefix}", flush=True)
+            delete_prefix(s3, cfg.bucket, prefix)
+            build_dataset(args, setting, prefix, extra)
+        files, nbytes = dataset_objects(s3, cfg.bucket, prefix)
+        print(f"{setting.name}: {files:,} files, {nbytes / 1e6:,.1f} MB", flush=True)
+
+        for name, (setup, cases) in benches.items():
+            setup = [s.replace(DATASET_URL, f"s3://{cfg.bucket}/{prefix}/") for s in setup]
+            cases = [(label, s.replace(DATASET_URL, f"s3://{cfg.bucket}/{prefix}/")) for label, s in cases]
+            runs, errors = run_bench(cmd, bench_script(args.bootstrap, setup, cases, args.repeat))
+            for label, _ in cases:
+                case_runs = runs.get(label)
+                if not case_runs:
+                    print(f"  {name} {label}: no result{': ' + errors.splitlines()[-1] if errors else ''}", flush=True)
+                    continue
+                row = {
+                    "setting": setting.name,
+                    "row_group_rows": setting.row_group_rows,
+                    "target_file_mb": setting.file_mb or "",
+                    "data_page_kb": setting.page_kb or "",
+                    "files": files,
+                    "dataset_mb": round(nbytes / 1e6, 1),
+                    "bench": name,
+                    "case": label,
+                    "latency_ms": round(statistics.median(r[0] for r in case_runs) * 1000, 1),
+                    "s3_gets": case_runs[0][1],
+                    "mb_read": round(case_runs[0][2] / 1e6, 2),
+                }
+                results.append(row)
+                print(
+                    f"  {name} {label}: {row['latency_ms']:,.1f} ms, {row['s3_gets']:,} GETs, {row['mb_read']:,.2f} MB",
+                    flush=True,
+                )
+
+    print("\n--- layout summary (per case: median latency, S3 GETs) ---", flush=True)
+    labels = list(dict.fromkeys(r["case"] for r in results))
+    print(f"{'setting':<36}" + "".join(f"{label:>18}" for label in labels), flush=True)
+    for setting in settings:
+        by_case = {r["case"]: r for r in results if r["setting"] == setting.name}
+        cells = [
+            f"{by_case[label]['latency_ms']:,.0f}ms/{by_case[label]['s3_gets']}" if label in by_case else "-"
+            for label in labels
+        ]
+        print(f"{setting.name:<36}" + "".join(f"{c:>18}" for c in cells), flush=True)
+
+    if args.csv and results:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"Wrote {len(results)} rows to {args.csv}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
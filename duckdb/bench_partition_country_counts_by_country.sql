@@ -0,0 +1,106 @@
+.read /data/bootstrap.sql
+.timer on
+
+-- Country counts, date partitions vs date+country partitions (S3 vs S3)
+-- Execution focus: hive pruning on the country= level below date=.
+-- Showcases: a single-country report opens only that country's files; a report over all
+--            countries reads every file either way (and pays for more, smaller files).
+-- Setup: write a country-partitioned copy next to s3://lake/vehicles, e.g. with
+--   python .\replay_vehicles.py --source s3://lake/vehicles --sink s3 --s3-prefix vehicles_by_country --partition-country
+-- my_partition maps the country to its country= directory and must match --country-partitions.
+-- Expected winner: by_country for one country, flat (or a tie) for all countries.
+-- Host (Windows): Get-Content duckdb\bench_partition_country_counts_by_country.sql | docker exec -i evo1-duckdb duckdb /data/duckdb.db
+
+CREATE OR REPLACE TEMP VIEW bench_params AS
+SELECT
+  DATE '2025-01-01' AS my_T,
+  3 AS my_D,
+  'D'::varchar AS my_country,
+  CASE WHEN 'D' IN ('A', 'D', 'F', 'I', 'L') THEN 'D' ELSE '_other' END AS my_partition;
+
+SELECT 'Question: Daily counts for one country and for all countries, flat vs country-partitioned' AS info;
+SELECT
+  'Args: T=' || CAST(my_T AS VARCHAR) ||
+  ', D=' || CAST(my_D AS VARCHAR) || ' days' ||
+  ', country=' || my_country ||
+  ', partition=country=' || my_partition AS info
+FROM bench_params;
+
+CREATE OR REPLACE VIEW s3_in AS
+SELECT *
+FROM read_parquet(
+  's3://lake/vehicles/direction=incoming/date=*/part-*.parquet',
+  hive_partitioning=1
+);
+
+CREATE OR REPLACE VIEW s3_in_by_country AS
+SELECT *
+FROM read_parquet(
+  's3://lake/vehicles_by_country/direction=incoming/date=*/country=*/part-*.parquet',
+  hive_partitioning=1
+);
+
+CALL enable_logging('FileSystem');
+
+-- One country: date partitions only
+CALL truncate_duckdb_logs();
+SELECT
+  'one.flat' AS case_src,
+  CAST(date AS DATE) AS day,
+  count(*) AS crossings
+FROM s3_in, bench_params
+WHERE CAST(date AS DATE) >= my_T
+  AND CAST(date AS DATE) < (my_T + (my_D::INT) * INTERVAL '1 day')
+  AND country_of_registration = my_country
+GROUP BY 2
+ORDER BY 2;
+SELECT 'one.flat' AS case_src, count(DISTINCT path) AS files, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+-- One country: date + country partitions
+CALL truncate_duckdb_logs();
+SELECT
+  'one.by_country' AS case_src,
+  CAST(date AS DATE) AS day,
+  count(*) AS crossings
+FROM s3_in_by_country, bench_params
+WHERE CAST(date AS DATE) >= my_T
+  AND CAST(date AS DATE) < (my_T + (my_D::INT) * INTERVAL '1 day')
+  AND country = my_partition
+  AND country_of_registration = my_country
+GROUP BY 2
+ORDER BY 2;
+SELECT 'one.by_country' AS case_src, count(DISTINCT path) AS files, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+-- All countries: date partitions only
+CALL truncate_duckdb_logs();
+SELECT
+  'all.flat' AS case_src,
+  country_of_registration AS country,
+  count(*) AS crossings
+FROM s3_in, bench_params
+WHERE CAST(date AS DATE) >= my_T
+  AND CAST(date AS DATE) < (my_T + (my_D::INT) * INTERVAL '1 day')
+GROUP BY 2
+ORDER BY crossings DESC
+LIMIT 50;
+SELECT 'all.flat' AS case_src, count(DISTINCT path) AS files, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+-- All countries: date + country partitions
+CALL truncate_duckdb_logs();
+SELECT
+  'all.by_country' AS case_src,
+  country_of_registration AS country,
+  count(*) AS crossings
+FROM s3_in_by_country, bench_params
+WHERE CAST(date AS DATE) >= my_T
+  AND CAST(date AS DATE) < (my_T + (my_D::INT) * INTERVAL '1 day')
+GROUP BY 2
+ORDER BY crossings DESC
+LIMIT 50;
+SELECT 'all.by_country' AS case_src, count(DISTINCT path) AS files, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+CALL disable_logging();
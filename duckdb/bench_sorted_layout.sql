@@ -0,0 +1,70 @@
+.read /data/bootstrap.sql
+.timer on
+
+-- Sorted-within-part layout vs ingest (ts) order (S3 vs S3)
+-- Execution focus: row-group skipping by min/max statistics.
+-- Showcases: a (country, plate) point lookup prunes nearly every row group of the sorted copy,
+--            while a narrow ts window can no longer skip row groups there.
+-- Setup: write a sorted copy next to s3://lake/vehicles, e.g. with
+--   python .\replay_vehicles.py --source s3://lake/vehicles --sink s3 --s3-prefix vehicles_sorted --sort-within-part country,plate,ts --row-group-rows 20000
+-- Expected winner: sorted for the lookup, ts order for the time window.
+-- Host (Windows): Get-Content duckdb\bench_sorted_layout.sql | docker exec -i evo1-duckdb duckdb /data/duckdb.db
+
+CREATE OR REPLACE TEMP VIEW bench_params AS
+SELECT
+  'D'::varchar AS my_country,
+  'D-TE9973'::varchar AS my_plate,
+  TIMESTAMPTZ '2025-01-03 00:00:00+00' AS my_start,
+  TIMESTAMPTZ '2025-01-03 01:00:00+00' AS my_end;
+
+SELECT 'Question: Plate lookup and time window, ts-ordered vs sorted parts' AS info;
+SELECT
+  'Args: country=' || my_country ||
+  ', plate=' || my_plate ||
+  ', start=' || CAST(my_start AS VARCHAR) ||
+  ', end=' || CAST(my_end AS VARCHAR) AS info
+FROM bench_params;
+
+-- Plate lookup: ts-ordered parts
+SELECT
+  'lookup.ts_order' AS case_src,
+  count(*) AS rows
+FROM read_parquet(
+  's3://lake/vehicles/direction=*/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE country_of_registration = my_country
+  AND license_plate = my_plate;
+
+-- Plate lookup: sorted parts
+SELECT
+  'lookup.sorted' AS case_src,
+  count(*) AS rows
+FROM read_parquet(
+  's3://lake/vehicles_sorted/direction=*/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE country_of_registration = my_country
+  AND license_plate = my_plate;
+
+-- Time window: ts-ordered parts
+SELECT
+  'time.ts_order' AS case_src,
+  count(*) AS rows
+FROM read_parquet(
+  's3://lake/vehicles/direction=incoming/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE ts >= my_start
+  AND ts < my_end;
+
+-- Time window: sorted parts
+SELECT
+  'time.sorted' AS case_src,
+  count(*) AS rows
+FROM read_parquet(
+  's3://lake/vehicles_sorted/direction=incoming/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE ts >= my_start
+  AND ts < my_end;
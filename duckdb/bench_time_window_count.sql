@@ -3,7 +3,10 @@
 
 -- Narrow time-window count (PG vs S3)
 -- Execution focus: selective time-range filter on ts.
--- Showcases: time-window filtering and potential pushdown differences.
+-- Showcases: time-window filtering and potential pushdown differences; the S3 case also reports
+--            its GETs and bytes read (DuckDB skips row groups by min/max but decodes whole column
+--            chunks; python .\page_index_report.py --start ... --end ... counts the pages a
+--            page-index reader would read instead).
 -- Expected winner: S3 (DuckDB postgres_scan overhead dominates here).
 -- Host (Windows): Get-Content duckdb\bench_time_window_count.sql | docker exec -i evo1-duckdb duckdb /data/duckdb.db
 
@@ -31,6 +34,8 @@ WHERE ts >= my_start
   AND ts < my_end;
 
 -- S3: filter by ts
+CALL enable_logging('HTTP');
+CALL truncate_duckdb_logs();
 SELECT
   'time.S3' AS case_src,
   count(*) AS rows
@@ -40,3 +45,11 @@ FROM read_parquet(
 ), bench_params
 WHERE ts >= my_start
   AND ts < my_end;
+
+-- S3: requests and bytes read by the case above
+SELECT
+  'time.S3' AS io_of,
+  count(*) FILTER (WHERE request.type = 'GET') AS s3_gets,
+  sum(TRY_CAST(response.headers['Content-Length'] AS BIGINT)) FILTER (WHERE request.type = 'GET') AS bytes_read
+FROM duckdb_logs_parsed('HTTP');
+CALL disable_logging();
@@ -0,0 +1,78 @@
+.read /data/bootstrap.sql
+.timer on
+
+-- Vehicle history lookup with and without license_plate bloom filters (S3 vs S3)
+-- Execution focus: row-group skipping by bloom filter where min/max statistics cannot help.
+-- Showcases: bytes read per case (FileSystem log) next to .timer latency; a plate that never
+--            passed the border is pruned without reading a single data page of the bloom copy.
+-- Setup: write a copy with bloom filters next to s3://lake/vehicles, e.g. with
+--   python .\replay_vehicles.py --source s3://lake/vehicles --sink s3 --s3-prefix vehicles_bloom --bloom-filter-fpp 0.01 --row-group-rows 20000
+-- Expected winner: bloom for rare and absent plates; frequent plates hit most row groups either way.
+-- Host (Windows): Get-Content duckdb\bench_vehicle_history_lookup_bloom.sql | docker exec -i evo1-duckdb duckdb /data/duckdb.db
+
+CREATE OR REPLACE TEMP VIEW bench_params AS
+SELECT
+  'D-TE9973'::varchar AS my_plate,
+  'D-AA0000'::varchar AS my_absent_plate;
+
+SELECT 'Question: Full history of one plate, plain vs bloom-filtered parts' AS info;
+SELECT
+  'Args: plate=' || my_plate ||
+  ', absent_plate=' || my_absent_plate AS info
+FROM bench_params;
+
+CALL enable_logging('FileSystem');
+
+-- Present plate: plain parts
+CALL truncate_duckdb_logs();
+SELECT
+  'present.plain' AS case_src,
+  count(*) AS rows
+FROM read_parquet(
+  's3://lake/vehicles/direction=*/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE license_plate = my_plate;
+SELECT 'present.plain' AS case_src, count(*) AS reads, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+-- Present plate: bloom-filtered parts
+CALL truncate_duckdb_logs();
+SELECT
+  'present.bloom' AS case_src,
+  count(*) AS rows
+FROM read_parquet(
+  's3://lake/vehicles_bloom/direction=*/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE license_plate = my_plate;
+SELECT 'present.bloom' AS case_src, count(*) AS reads, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+-- Absent plate: plain parts
+CALL truncate_duckdb_logs();
+SELECT
+  'absent.plain' AS case_src,
+  count(*) AS rows
+FROM read_parquet(
+  's3://lake/vehicles/direction=*/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE license_plate = my_absent_plate;
+SELECT 'absent.plain' AS case_src, count(*) AS reads, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+-- Absent plate: bloom-filtered parts
+CALL truncate_duckdb_logs();
+SELECT
+  'absent.bloom' AS case_src,
+  count(*) AS rows
+FROM read_parquet(
+  's3://lake/vehicles_bloom/direction=*/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE license_plate = my_absent_plate;
+SELECT 'absent.bloom' AS case_src, count(*) AS reads, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+CALL disable_logging();
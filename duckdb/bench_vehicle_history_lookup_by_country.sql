@@ -0,0 +1,78 @@
+.read /data/bootstrap.sql
+.timer on
+
+-- Vehicle history lookup, date partitions vs date+country partitions (S3 vs S3)
+-- Execution focus: hive pruning on the country= level below date=.
+-- Showcases: the (country, plate) lookup opens only the plate's country= directory instead of every
+--            part; plates of bucketed countries still scan the shared country=_other files.
+-- Setup: write a country-partitioned copy next to s3://lake/vehicles, e.g. with
+--   python .\replay_vehicles.py --source s3://lake/vehicles --sink s3 --s3-prefix vehicles_by_country --partition-country
+-- my_partition maps the country to its country= directory and must match --country-partitions.
+-- Expected winner: by_country.
+-- Host (Windows): Get-Content duckdb\bench_vehicle_history_lookup_by_country.sql | docker exec -i evo1-duckdb duckdb /data/duckdb.db
+
+CREATE OR REPLACE TEMP VIEW bench_params AS
+SELECT
+  'D'::varchar AS my_country,
+  'D-TE9973'::varchar AS my_plate,
+  CASE WHEN 'D' IN ('A', 'D', 'F', 'I', 'L') THEN 'D' ELSE '_other' END AS my_partition,
+  100::int AS my_limit;
+
+SELECT 'Question: Recent history for a single vehicle, flat vs country-partitioned' AS info;
+SELECT
+  'Args: country=' || my_country ||
+  ', plate=' || my_plate ||
+  ', partition=country=' || my_partition ||
+  ', limit=' || my_limit AS info
+FROM bench_params;
+
+CALL enable_logging('FileSystem');
+
+-- Date partitions only
+CALL truncate_duckdb_logs();
+SELECT
+  'hist.flat' AS case_src,
+  ts,
+  country_of_registration,
+  license_plate,
+  vehicle_type,
+  colour,
+  brand,
+  location_of_crossing,
+  direction AS dir
+FROM read_parquet(
+  's3://lake/vehicles/direction=*/date=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE country_of_registration = my_country
+  AND license_plate = my_plate
+ORDER BY ts DESC
+LIMIT (SELECT my_limit FROM bench_params);
+SELECT 'hist.flat' AS case_src, count(DISTINCT path) AS files, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+-- Date + country partitions
+CALL truncate_duckdb_logs();
+SELECT
+  'hist.by_country' AS case_src,
+  ts,
+  country_of_registration,
+  license_plate,
+  vehicle_type,
+  colour,
+  brand,
+  location_of_crossing,
+  direction AS dir
+FROM read_parquet(
+  's3://lake/vehicles_by_country/direction=*/date=*/country=*/part-*.parquet',
+  hive_partitioning=1
+), bench_params
+WHERE country = my_partition
+  AND country_of_registration = my_country
+  AND license_plate = my_plate
+ORDER BY ts DESC
+LIMIT (SELECT my_limit FROM bench_params);
+SELECT 'hist.by_country' AS case_src, count(DISTINCT path) AS files, sum(bytes) AS bytes_read
+FROM duckdb_logs_parsed('FileSystem') WHERE op = 'READ';
+
+CALL disable_logging();
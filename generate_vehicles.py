@@ -1,17 +1,32 @@
 #!/usr/bin/env python3
 import argparse
+import json
+import os
+import queue
+import shutil
+import struct
+import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-from typing import Dict, List, Tuple
+from itertools import zip_longest
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
 
 import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.fs as pafs
 import pyarrow.parquet as pq
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 import psycopg
+from psycopg.conninfo import conninfo_to_dict
 
 
 # -----------------------------
@@ -149,16 +164,54 @@ def to_iso1(country: str) -> str:
     return ISO1_MAP.get(country, country[0])
 
 
-def apply_iso1_codes(df: pd.DataFrame) -> pd.DataFrame:
+def iso1_lookup(names: Sequence[str]) -> Tuple[pa.Array, np.ndarray]:
+    """ISO-1 dictionary for a list of distinct country names, plus each name's index into it."""
+    iso1_names = sorted({to_iso1(c) for c in names})
+    remap = np.array([iso1_names.index(to_iso1(c)) for c in names], dtype=ARROW_DICT_INDEX)
+    return pa.array(iso1_names, type=pa.string()), remap
+
+
+def iso1_plates(plates, iso1: pa.Array) -> pa.Array:
+    """Swap each plate's country prefix (everything before the first "-") for the row's ISO-1 code."""
+    suffix = pc.replace_substring_regex(plates, pattern="^[^-]*", replacement="")
+    return pc.binary_join_element_wise(iso1, suffix, "")
+
+
+def apply_iso1_codes(df: Union[pd.DataFrame, pa.Table]) -> Union[pd.DataFrame, pa.Table]:
+    """
+    Recode country_of_registration to ISO-1 and rewrite the plate prefixes to match.
+    Only the distinct country names go through to_iso1(); rows are remapped by code.
+    """
+    if isinstance(df, pa.Table):
+        return apply_iso1_codes_table(df)
     if df.empty:
         return df
-    iso1 = np.array([to_iso1(c) for c in df["country_of_registration"].to_numpy()], dtype=object)
-    df["country_of_registration"] = iso1
-    suffix = df["license_plate"].str.split("-", n=1).str[1]
-    df["license_plate"] = pd.Series(iso1, index=df.index) + "-" + suffix
+    country = df["country_of_registration"]
+    if isinstance(country.dtype, pd.CategoricalDtype):
+        codes, names = country.cat.codes.to_numpy(), list(country.cat.categories)
+    else:
+        codes, names = pd.factorize(country)
+        names = list(names)
+    iso1_names, remap = iso1_lookup(names)
+    iso1_codes = remap[codes]
+    plates = iso1_plates(pa.array(df["license_plate"], type=pa.string()), iso1_names.take(iso1_codes))
+    df["country_of_registration"] = pd.Categorical.from_codes(iso1_codes, iso1_names.to_pylist())
+    df["license_plate"] = plates.to_pandas().set_axis(df.index)
     return df
 
 
+def apply_iso1_codes_table(table: pa.Table) -> pa.Table:
+    """ISO-1 recoding for Arrow tables: remap the country dictionary, rewrite plate prefixes."""
+    if table.num_rows == 0:
+        return table
+    country = table["country_of_registration"].combine_chunks()
+    iso1_names, remap = iso1_lookup(country.dictionary.to_pylist())
+    iso1 = pa.DictionaryArray.from_arrays(pa.array(remap[country.indices.to_numpy()]), iso1_names)
+    plates = iso1_plates(table["license_plate"], iso1.dictionary.take(iso1.indices))
+    table = table.set_column(table.schema.get_field_index("country_of_registration"), "country_of_registration", iso1)
+    return table.set_column(table.schema.get_field_index("license_plate"), "license_plate", plates)
+
+
 def build_country_weights(rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
     """
     Returns (countries, weights) normalized.
@@ -235,23 +288,542 @@ def sequential_seconds(rng: np.random.Generator, n: int) -> np.ndarray:
     return secs.astype(int)
 
 
+def stream_sequential_seconds(rng: np.random.Generator, n: int, block_rows: int) -> Iterator[np.ndarray]:
+    """
+    sequential_seconds() in blocks of at most block_rows, without holding all n gaps.
+    The share of the remaining day covered by the next k of m remaining gaps is
+    Beta(k, m - k) distributed, so drawing that share first and then spreading k
+    normalized gaps over it gives exactly the distribution of the one-shot version.
+    """
+    lo = 0.0
+    remaining = n
+    while remaining > 0:
+        k = min(block_rows, remaining)
+        span = (1.0 - lo) * (rng.beta(k, remaining - k) if remaining > k else 1.0)
+        cum = np.cumsum(rng.exponential(scale=1.0, size=k))
+        yield ((lo + span * cum / cum[-1]) * 86399).astype(int)
+        lo += span
+        remaining -= k
+
+
+# -----------------------------
+# Integer-coded lookup tables for the vectorized generator
+# -----------------------------
+PLATE_LETTERS = list("ABCDEFGHJKLMNPQRSTUVWXYZ")
+PLATE_LETTER_PAIRS = np.array([a + b for a in PLATE_LETTERS for b in PLATE_LETTERS], dtype=object)
+PLATE_DIGITS = np.array([f"{d:04d}" for d in range(10000)], dtype=object)
+
+VEHICLE_TYPE_NAMES = np.array([t for t, _ in VEHICLE_TYPES], dtype=object)
+VEHICLE_TYPE_PROBS = np.array([p for _, p in VEHICLE_TYPES], dtype=float)
+VEHICLE_TYPE_PROBS = VEHICLE_TYPE_PROBS / VEHICLE_TYPE_PROBS.sum()
+
+# distinct brand names; each vehicle type owns a slice of BRAND_TABLE (codes into BRAND_NAMES)
+BRAND_NAMES = np.array(
+    sorted({b for t, _ in VEHICLE_TYPES for b in BRANDS_BY_TYPE.get(t, ["Generic"])}), dtype=object
+)
+BRAND_TABLE = np.array(
+    [
+        BRAND_NAMES.tolist().index(b)
+        for t, _ in VEHICLE_TYPES
+        for b in BRANDS_BY_TYPE.get(t, ["Generic"])
+    ]
+)
+BRAND_COUNTS = np.array([len(BRANDS_BY_TYPE.get(t, ["Generic"])) for t, _ in VEHICLE_TYPES])
+BRAND_OFFSETS = np.concatenate([[0], np.cumsum(BRAND_COUNTS)[:-1]])
+
+COLOUR_NAMES = np.array(COLOURS, dtype=object)
+CROSSING_NAMES = np.array(ALL_CROSSINGS, dtype=object)
+
+TS_DTYPE = "datetime64[us, UTC]"
+
+EVENT_COLUMNS = [
+    "ts",
+    "country_of_registration",
+    "license_plate",
+    "vehicle_type",
+    "colour",
+    "brand",
+    "location_of_crossing",
+]
+
+
+def event_categories(countries: np.ndarray) -> Dict[str, Sequence[str]]:
+    """Fixed categories (Arrow/Parquet dictionaries) of the low-cardinality event columns."""
+    return {
+        "country_of_registration": [str(c) for c in countries],
+        "vehicle_type": VEHICLE_TYPE_NAMES,
+        "colour": COLOUR_NAMES,
+        "brand": BRAND_NAMES,
+        "location_of_crossing": CROSSING_NAMES,
+    }
+
+
+def categorize_frame(df: pd.DataFrame, countries: np.ndarray) -> pd.DataFrame:
+    """Convert an events frame's low-cardinality string columns to categoricals with the fixed categories."""
+    return df.astype({c: pd.CategoricalDtype(cats) for c, cats in event_categories(countries).items()})
+
+
+def seconds_to_ts(day_start: datetime, secs: np.ndarray) -> pd.DatetimeIndex:
+    """Convert second offsets within a day to a UTC timestamp index (microsecond unit)."""
+    base = np.datetime64(day_start.replace(tzinfo=None), "us")
+    us = base + np.asarray(secs, dtype="int64").astype("timedelta64[s]")
+    return pd.DatetimeIndex(us).tz_localize("UTC")
+
+
+def crossing_table(countries: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten the per-country crossing candidates used by choose_crossing().
+    Returns (codes into CROSSING_NAMES, offsets, counts) indexed by the position
+    of a country in `countries`.
+    """
+    codes: List[int] = []
+    offsets = np.zeros(len(countries), dtype=np.int64)
+    counts = np.zeros(len(countries), dtype=np.int64)
+    for i, c in enumerate(countries):
+        candidates = CORRIDOR_TO_CROSSINGS.get(str(c), ALL_CROSSINGS)
+        offsets[i] = len(codes)
+        counts[i] = len(candidates)
+        codes.extend(ALL_CROSSINGS.index(loc) for loc in candidates)
+    return np.array(codes, dtype=np.int64), offsets, counts
+
+
+def pick_within(rng: np.random.Generator, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Uniformly pick one entry per row from flattened groups given per-row offsets/counts."""
+    local = (rng.random(size=len(counts)) * counts).astype(np.int64)
+    return offsets + np.minimum(local, counts - 1)
+
+
+def bulk_crossings(rng: np.random.Generator, country: np.ndarray) -> np.ndarray:
+    """Vectorized choose_crossing() for an array of country codes."""
+    uniq, inv = np.unique(np.asarray(country, dtype=object), return_inverse=True)
+    codes, offsets, counts = crossing_table(uniq)
+    return CROSSING_NAMES[codes[pick_within(rng, offsets[inv], counts[inv])]]
+
+
+def baseline_codes(
+    rng: np.random.Generator,
+    n: int,
+    countries: np.ndarray,
+    weights: np.ndarray,
+    secs: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Sample every baseline attribute as integer codes in bulk, with the same
+    distributions as random_plate/choose_brand/choose_crossing.
+    country indexes `countries`; brand, colour, vehicle_type and crossing index
+    BRAND_NAMES, COLOUR_NAMES, VEHICLE_TYPE_NAMES and CROSSING_NAMES.
+    secs: arrival seconds drawn by the caller (streamed days); sampled here if omitted.
+    Codes are narrowed as soon as each is drawn: the dictionary columns to ARROW_DICT_INDEX,
+    the plate letter pair and digits (too many values for it) to int32.
+    """
+    country_idx = rng.choice(len(countries), size=n, p=weights).astype(ARROW_DICT_INDEX)
+    pair_idx = rng.integers(0, len(PLATE_LETTER_PAIRS), size=n).astype(np.int32)
+    digits = rng.integers(0, 10000, size=n).astype(np.int32)
+
+    vtype_idx = rng.choice(len(VEHICLE_TYPE_NAMES), size=n, p=VEHICLE_TYPE_PROBS).astype(ARROW_DICT_INDEX)
+    colour_idx = rng.integers(0, len(COLOUR_NAMES), size=n).astype(ARROW_DICT_INDEX)
+    brand_idx = BRAND_TABLE[pick_within(rng, BRAND_OFFSETS[vtype_idx], BRAND_COUNTS[vtype_idx])]
+    brand_idx = brand_idx.astype(ARROW_DICT_INDEX)
+
+    cross_codes, cross_offsets, cross_counts = crossing_table(countries)
+    loc_idx = cross_codes[pick_within(rng, cross_offsets[country_idx], cross_counts[country_idx])]
+    loc_idx = loc_idx.astype(ARROW_DICT_INDEX)
+
+    # sequential arrivals with small random gaps
+    if secs is None:
+        secs = sequential_seconds(rng, n)
+
+    return {
+        "secs": secs,
+        "country": country_idx,
+        "plate_pair": pair_idx,
+        "plate_digits": digits,
+        "vehicle_type": vtype_idx,
+        "colour": colour_idx,
+        "brand": brand_idx,
+        "crossing": loc_idx,
+    }
+
+
+def vectorized_baseline_events(
+    rng: np.random.Generator,
+    day_start: datetime,
+    n: int,
+    countries: np.ndarray,
+    weights: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Array-based equivalent of the per-row baseline generator.
+    Attributes are sampled as integer codes and kept as categoricals over the fixed categories;
+    only the plates are materialized as strings.
+    """
+    codes = baseline_codes(rng, n, countries, weights)
+    cats = event_categories(countries)
+    country_names = np.array(cats["country_of_registration"], dtype=object)
+
+    # plates: "<CC>-" + two letters + four digits, built from prefix tables
+    heads = (country_names[:, None] + "-" + PLATE_LETTER_PAIRS[None, :]).ravel()
+    plates = (
+        heads[codes["country"].astype(np.int32) * len(PLATE_LETTER_PAIRS) + codes["plate_pair"]]
+        + PLATE_DIGITS[codes["plate_digits"]]
+    )
+
+    return pd.DataFrame(
+        {
+            "ts": seconds_to_ts(day_start, codes["secs"]),
+            "country_of_registration": pd.Categorical.from_codes(codes["country"], cats["country_of_registration"]),
+            "license_plate": plates,
+            "vehicle_type": pd.Categorical.from_codes(codes["vehicle_type"], cats["vehicle_type"]),
+            "colour": pd.Categorical.from_codes(codes["colour"], cats["colour"]),
+            "brand": pd.Categorical.from_codes(codes["brand"], cats["brand"]),
+            "location_of_crossing": pd.Categorical.from_codes(codes["crossing"], cats["location_of_crossing"]),
+        }
+    )
+
+
+# -----------------------------
+# Arrow-native generation
+# (ts as int64 microseconds, low-cardinality columns dictionary-encoded)
+# -----------------------------
+ARROW_TS_TYPE = pa.timestamp("us", tz="UTC")
+# every dictionary (countries, crossings, brands, colours, vehicle types) has well under 128 entries,
+# so one byte per row is enough for the indices, the same width as the pandas categorical codes
+ARROW_DICT_INDEX = np.int8
+ARROW_DICT_TYPE = pa.dictionary(pa.from_numpy_dtype(ARROW_DICT_INDEX), pa.string())
+ARROW_SCHEMA = pa.schema(
+    [
+        pa.field("ts", ARROW_TS_TYPE),
+        pa.field("country_of_registration", ARROW_DICT_TYPE),
+        pa.field("license_plate", pa.string()),
+        pa.field("vehicle_type", ARROW_DICT_TYPE),
+        pa.field("colour", ARROW_DICT_TYPE),
+        pa.field("brand", ARROW_DICT_TYPE),
+        pa.field("location_of_crossing", ARROW_DICT_TYPE),
+    ]
+)
+
+
+# dictionary pages only for the dictionary-typed columns; ts and plates are high-cardinality and store smaller plain
+# the page index (column + offset index) lets readers skip pages inside a row group, e.g. an hour of ts;
+# Arrow writes it for every column, which costs a few KB per file
+PARQUET_WRITE_OPTIONS = {
+    "compression": "zstd",
+    "use_dictionary": [f.name for f in ARROW_SCHEMA if pa.types.is_dictionary(f.type)],
+    "write_page_index": True,
+}
+
+
+def dict_column(codes: np.ndarray, names) -> pa.DictionaryArray:
+    return pa.DictionaryArray.from_arrays(
+        pa.array(np.asarray(codes, dtype=ARROW_DICT_INDEX)), pa.array(list(names), type=pa.string())
+    )
+
+
+def encode_dict_column(values, names) -> pa.DictionaryArray:
+    """Dictionary-encode string values against a fixed dictionary."""
+    dictionary = pa.array(list(names), type=pa.string())
+    codes = pc.index_in(pa.array(values, type=pa.string()), value_set=dictionary)
+    return pa.DictionaryArray.from_arrays(codes.cast(ARROW_DICT_TYPE.index_type), dictionary)
+
+
+def day_start_us(day_start: datetime) -> int:
+    return int(day_start.timestamp()) * 1_000_000
+
+
+def arrow_baseline_events(
+    rng: np.random.Generator,
+    day_start: datetime,
+    n: int,
+    countries: np.ndarray,
+    weights: np.ndarray,
+    secs: Optional[np.ndarray] = None,
+) -> pa.Table:
+    """Arrow-native twin of vectorized_baseline_events (same codes, no pandas)."""
+    codes = baseline_codes(rng, n, countries, weights, secs)
+    country_names = [str(c) for c in countries]
+
+    heads = pa.array(
+        (np.array(country_names, dtype=object)[:, None] + "-" + PLATE_LETTER_PAIRS[None, :]).ravel(),
+        type=pa.string(),
+    )
+    plates = pc.binary_join_element_wise(
+        heads.take(pa.array(codes["country"].astype(np.int32) * len(PLATE_LETTER_PAIRS) + codes["plate_pair"])),
+        pa.array(PLATE_DIGITS, type=pa.string()).take(pa.array(codes["plate_digits"])),
+        "",
+    )
+    ts = day_start_us(day_start) + codes["secs"].astype(np.int64) * 1_000_000
+
+    return pa.Table.from_arrays(
+        [
+            pa.array(ts, type=ARROW_TS_TYPE),
+            dict_column(codes["country"], country_names),
+            plates,
+            dict_column(codes["vehicle_type"], VEHICLE_TYPE_NAMES),
+            dict_column(codes["colour"], COLOUR_NAMES),
+            dict_column(codes["brand"], BRAND_NAMES),
+            dict_column(codes["crossing"], CROSSING_NAMES),
+        ],
+        schema=ARROW_SCHEMA,
+    )
+
+
+def frame_to_table(df: pd.DataFrame, countries: np.ndarray) -> pa.Table:
+    """Encode a (small) injected-events frame with the same dictionaries as the baseline table."""
+    return pa.Table.from_arrays(
+        [
+            pa.array(df["ts"].astype(TS_DTYPE), type=ARROW_TS_TYPE),
+            encode_dict_column(df["country_of_registration"], [str(c) for c in countries]),
+            pa.array(df["license_plate"], type=pa.string()),
+            encode_dict_column(df["vehicle_type"], VEHICLE_TYPE_NAMES),
+            encode_dict_column(df["colour"], COLOUR_NAMES),
+            encode_dict_column(df["brand"], BRAND_NAMES),
+            encode_dict_column(df["location_of_crossing"], CROSSING_NAMES),
+        ],
+        schema=ARROW_SCHEMA,
+    )
+
+
+def misplacement_moves(rng: np.random.Generator, n: int, per_day: int, max_offset: int) -> Dict[int, int]:
+    """
+    Draw a day's ingest misplacements (swaps of rows up to max_offset apart) and replay
+    them sparsely: returns output position -> source position for the moved rows only.
+    """
+    if per_day <= 0 or max_offset <= 0 or n == 0:
+        return {}
+    k = min(per_day, n)
+    idx = rng.choice(n, size=k, replace=False)
+    offsets = rng.integers(-max_offset, max_offset + 1, size=k)
+    new_idx = np.clip(idx + offsets, 0, n - 1)
+    perm: Dict[int, int] = {}
+    for i, j in zip(idx.tolist(), new_idx.tolist()):
+        perm[i], perm[j] = perm.get(j, j), perm.get(i, i)
+    return {pos: src for pos, src in perm.items() if pos != src}
+
+
+def ingest_order(
+    rng: np.random.Generator,
+    n: int,
+    per_day: int,
+    max_offset: int,
+    order: Optional[np.ndarray] = None,
+) -> Optional[np.ndarray]:
+    """
+    Take indices that apply the day's misplacement swaps to n rows. If `order` is given
+    (take indices that put the rows in time order, see merge_order), the swaps act on the
+    ordered rows and are written into `order` itself. None if the rows stay as they are.
+    """
+    if order is None and (per_day <= 0 or max_offset <= 0 or n == 0):
+        return None
+    perm = np.arange(n) if order is None else order
+    moves = misplacement_moves(rng, n, per_day, max_offset)
+    if moves:
+        # the right-hand side is gathered before anything is written, so swaps see the original order
+        perm[np.fromiter(moves.keys(), np.int64, len(moves))] = perm[np.fromiter(moves.values(), np.int64, len(moves))]
+    return perm
+
+
 def apply_ingest_misplacements(
     rng: np.random.Generator,
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, pa.Table],
     per_day: int,
     max_offset: int,
-) -> pd.DataFrame:
-    if per_day <= 0 or max_offset <= 0 or df.empty:
+    order: Optional[np.ndarray] = None,
+) -> Union[pd.DataFrame, pa.Table]:
+    """
+    Apply the day's misplacement swaps to the rows of df. If `order` is given (take
+    indices that put df in time order, see merge_order), the swaps act on the ordered
+    rows and both are applied in the same single take.
+    """
+    perm = ingest_order(rng, len(df), per_day, max_offset, order)
+    if perm is None:
         return df
-    n = min(per_day, len(df))
-    idx = rng.choice(df.index.to_numpy(), size=n, replace=False)
-    offsets = rng.integers(-max_offset, max_offset + 1, size=n)
-    new_idx = np.clip(idx + offsets, 0, len(df) - 1)
-    for i, j in zip(idx, new_idx):
-        if i == j:
-            continue
-        df.iloc[[i, j]] = df.iloc[[j, i]].to_numpy()
-    return df
+    if isinstance(df, pa.Table):
+        return df.take(perm)
+    return df.take(perm).reset_index(drop=True)
+
+
+def take_columns(columns: List[pa.ChunkedArray], perm: Optional[np.ndarray]) -> pa.Table:
+    """
+    An ARROW_SCHEMA table of columns reordered by perm. Consumes the list: each source column
+    is dropped as soon as it has been taken, so only one column of the day exists twice at a time
+    (Table.take keeps the whole source table until the new one is complete).
+    """
+    taken = []
+    while columns:
+        column = columns.pop(0)
+        taken.append(column if perm is None else column.take(perm))
+    return pa.Table.from_arrays(taken, schema=ARROW_SCHEMA)
+
+
+def ts_us(df: Union[pd.DataFrame, pa.Table]) -> np.ndarray:
+    """The ts column as int64 microseconds since the Unix epoch."""
+    if isinstance(df, pa.Table):
+        return df["ts"].cast(ARROW_TS_TYPE).cast(pa.int64()).to_numpy()
+    return df["ts"].astype(TS_DTYPE).astype("int64").to_numpy()
+
+
+def merge_order(base_ts: np.ndarray, extra_ts: np.ndarray) -> np.ndarray:
+    """
+    Take indices that put rows [base..., extra...] in time order, given that base_ts is
+    already sorted: the (small) extra stream is sorted on its own and merged in by
+    binary search instead of sorting the whole day. Stable, like a stable sort of the
+    concatenation: on equal ts, base rows come first, then extra rows in input order.
+    """
+    n, m = len(base_ts), len(extra_ts)
+    extra_order = np.argsort(extra_ts, kind="stable")
+    dest = np.searchsorted(base_ts, extra_ts[extra_order], side="right") + np.arange(m)
+    order = np.empty(n + m, dtype=np.int64)
+    from_base = np.ones(n + m, dtype=bool)
+    from_base[dest] = False
+    order[from_base] = np.arange(n)
+    order[dest] = n + extra_order
+    return order
+
+
+def bulk_standout_events(
+    rng: np.random.Generator,
+    day_start: datetime,
+    vehicles: pd.DataFrame,
+    active_share: float,
+    k_range: Tuple[int, int],
+    drop_prob: float,
+    alternate: bool,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Expand a standout pool into the day's extra (incoming, outgoing) rows in one pass.
+    - active_share: fraction of the pool that crosses at all today
+    - k_range: [low, high) crossings per active vehicle
+    - drop_prob: probability a single crossing is missing
+    - alternate: directions alternate in/out per vehicle (else 50/50 random)
+    """
+    active = rng.random(size=len(vehicles)) < active_share
+    active_df = vehicles.loc[active].reset_index(drop=True)
+    k = rng.integers(k_range[0], k_range[1], size=len(active_df))
+    total = int(k.sum())
+
+    owner = np.repeat(np.arange(len(active_df)), k)
+    secs = rng.integers(0, 86400, size=total)
+    if alternate:
+        # position of each crossing within its vehicle's run: even -> incoming
+        run_start = np.repeat(np.cumsum(k) - k, k)
+        is_in = (np.arange(total) - run_start) % 2 == 0
+    else:
+        is_in = rng.random(size=total) < 0.5
+    keep = rng.random(size=total) >= drop_prob
+    owner, secs, is_in = owner[keep], secs[keep], is_in[keep]
+
+    events = active_df.take(owner).reset_index(drop=True)
+    events.insert(0, "ts", seconds_to_ts(day_start, secs))
+    events["location_of_crossing"] = bulk_crossings(rng, events["country_of_registration"].to_numpy())
+    return events.loc[is_in], events.loc[~is_in]
+
+
+# -----------------------------
+# Stage metrics
+# -----------------------------
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far (0 if it cannot be read)."""
+    try:
+        import resource
+    except ImportError:  # Windows: fall back to psutil when it is installed
+        try:
+            import psutil
+        except ImportError:
+            return 0
+        return int(getattr(psutil.Process().memory_info(), "peak_wset", 0))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def rss_growth(since: int) -> int:
+    """How far the process's peak RSS rose above `since` (a peak_rss_bytes() taken when a stage started)."""
+    return max(peak_rss_bytes() - since, 0)
+
+
+def frame_nbytes(df: Union[pd.DataFrame, pa.Table]) -> int:
+    """In-memory size of a day's rows (Arrow buffers, or the frame's column arrays)."""
+    if isinstance(df, pa.Table):
+        return df.nbytes
+    return int(df.memory_usage(index=False).sum())
+
+
+def stage_report(stages: Dict[str, dict]) -> Dict[str, dict]:
+    report = {}
+    for name, s in stages.items():
+        secs = s["seconds"]
+        report[name] = {
+            "seconds": round(secs, 4),
+            "rows": s["rows"],
+            "bytes": s["bytes"],
+            "rows_per_s": round(s["rows"] / secs, 1) if secs > 0 else 0.0,
+            "bytes_per_s": round(s["bytes"] / secs, 1) if secs > 0 else 0.0,
+            "rss_growth_mb": round(s["rss_growth"] / 1e6, 1),
+        }
+    return report
+
+
+class StageMetrics:
+    """
+    Thread-safe per-day accumulator of seconds, rows and bytes per ingest stage, plus how
+    much the stage raised the peak RSS of the process it ran in (stages running at the same
+    time each see the growth). Days are popped once all sinks wrote them; run totals are
+    kept for the summary.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._days: Dict[date, Dict[str, dict]] = {}
+        self._totals: Dict[str, dict] = {}
+
+    def add(self, day: date, stage: str, seconds: float, rows: int = 0, nbytes: int = 0, rss_growth: int = 0):
+        with self._lock:
+            for stages in (self._days.setdefault(day, {}), self._totals):
+                s = stages.setdefault(stage, {"seconds": 0.0, "rows": 0, "bytes": 0, "rss_growth": 0})
+                s["seconds"] += seconds
+                s["rows"] += rows
+                s["bytes"] += nbytes
+                s["rss_growth"] += rss_growth
+
+    def pop_day(self, day: date) -> Dict[str, dict]:
+        with self._lock:
+            stages = self._days.pop(day, {})
+        return stage_report(stages)
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return stage_report(self._totals)
+
+
+# report order of the stages (a run only shows the ones its sinks use)
+STAGES = (
+    "read",
+    "gen",
+    "sort",
+    "iso1",
+    "parquet_encode",
+    "upload",
+    "parquet_stream",
+    "localfs_write",
+    "copy_encode",
+    "copy_transfer",
+)
+
+
+def print_stage_summary(stages: Dict[str, dict]):
+    print("Stages (busy seconds summed over threads/processes):", flush=True)
+    for name in sorted(stages, key=lambda n: STAGES.index(n) if n in STAGES else len(STAGES)):
+        s = stages[name]
+        print(
+            f"  {name:<15}{s['seconds']:9.2f}s {s['rows_per_s']:>13,.0f} rows/s "
+            f"{s['bytes_per_s'] / 1e6:9.1f} MB/s  peak RSS +{s['rss_growth_mb']:,.0f} MB",
+            flush=True,
+        )
+
+
+def slice_rows(df: Union[pd.DataFrame, pa.Table], offset: int, length: int):
+    if isinstance(df, pa.Table):
+        return df.slice(offset, length)
+    return df.iloc[offset:offset + length]
 
 
 @dataclass
@@ -261,48 +833,381 @@ class S3Config:
     secret_key: str
     bucket: str
     prefix: str
+    upload_workers: int = 4
+    multipart_threshold: int = 64 * 1024 * 1024
+    multipart_chunksize: int = 16 * 1024 * 1024
 
 
 def s3_client(cfg: S3Config):
+    # one client shared by all upload threads; size its pool so connections are reused
     return boto3.client(
         "s3",
         endpoint_url=cfg.endpoint,
         aws_access_key_id=cfg.access_key,
         aws_secret_access_key=cfg.secret_key,
         region_name="us-east-1",
-        config=Config(s3={"addressing_style": "path"}),
+        config=Config(
+            s3={"addressing_style": "path"},
+            max_pool_connections=max(10, cfg.upload_workers * 2),
+        ),
+    )
+
+
+def s3_transfer_config(cfg: S3Config) -> TransferConfig:
+    # parts above the threshold switch to multipart upload automatically
+    return TransferConfig(
+        multipart_threshold=cfg.multipart_threshold,
+        multipart_chunksize=cfg.multipart_chunksize,
+        max_concurrency=4,
     )
 
 
-def write_parquet_to_s3(s3, cfg: S3Config, df: pd.DataFrame, direction: str, day: date, part: int):
-    day_str = day.isoformat()
-    key = f"{cfg.prefix}/direction={direction}/date={day_str}/part-{part:05d}.parquet"
+def s3_filesystem(cfg: S3Config) -> pafs.S3FileSystem:
+    """Arrow's S3 filesystem for streaming writes (output streams upload in multipart chunks)."""
+    url = urlparse(cfg.endpoint)
+    return pafs.S3FileSystem(
+        access_key=cfg.access_key,
+        secret_key=cfg.secret_key,
+        endpoint_override=url.netloc or url.path,
+        scheme=url.scheme or "http",
+        region="us-east-1",
+        background_writes=True,
+    )
+
 
-    table = pa.Table.from_pandas(df, preserve_index=False)
-    sink = pa.BufferOutputStream()
-    pq.write_table(table, sink, compression="zstd", row_group_size=250_000)
-    buf = sink.getvalue().to_pybytes()
+def hive_day_dir(root: str, direction: str, day: date) -> str:
+    return f"{root}/direction={direction}/date={day.isoformat()}"
 
-    s3.put_object(Bucket=cfg.bucket, Key=key, Body=buf)
 
+def hive_part_path(root: str, direction: str, day: date, part: int, country: Optional[str] = None) -> str:
+    day_dir = hive_day_dir(root, direction, day)
+    if country is not None:
+        day_dir = f"{day_dir}/country={country}"
+    return f"{day_dir}/part-{part:05d}.parquet"
+
+
+def part_key(cfg: S3Config, direction: str, day: date, part: int, country: Optional[str] = None) -> str:
+    return hive_part_path(cfg.prefix, direction, day, part, country)
+
+
+def as_table(df: Union[pd.DataFrame, pa.Table]) -> pa.Table:
+    """Arrow view of a chunk with the fixed ARROW_SCHEMA (categoricals and strings become int8 dictionaries)."""
+    if isinstance(df, pa.Table):
+        return df
+    return pa.Table.from_pandas(df[ARROW_SCHEMA.names], preserve_index=False).cast(ARROW_SCHEMA)
+
+
+# short names accepted by --sort-within-part
+SORT_COLUMN_ALIASES = {
+    "country": "country_of_registration",
+    "plate": "license_plate",
+    "type": "vehicle_type",
+    "crossing": "location_of_crossing",
+}
+
+
+def parse_sort_columns(text: str) -> Tuple[str, ...]:
+    """argparse type for --sort-within-part: comma-separated event columns or their short aliases."""
+    columns = tuple(SORT_COLUMN_ALIASES.get(c.strip(), c.strip()) for c in text.split(",") if c.strip())
+    if not columns or len(set(columns)) != len(columns) or any(c not in EVENT_COLUMNS for c in columns):
+        raise argparse.ArgumentTypeError(
+            f"expected distinct columns of {', '.join(EVENT_COLUMNS)} (or {', '.join(SORT_COLUMN_ALIASES)}), "
+            f"got {text!r}"
+        )
+    return columns
+
+
+def sort_key(column) -> pa.Array:
+    """Sortable stand-in for a column: a dictionary column becomes the rank of each row's value."""
+    if isinstance(column, pa.ChunkedArray) and pa.types.is_dictionary(column.type):
+        column = column.unify_dictionaries().combine_chunks()
+    if pa.types.is_dictionary(column.type):
+        return pc.rank(column.dictionary, sort_keys="ascending", tiebreaker="dense").take(column.indices)
+    return column
+
+
+# --partition-country: ISO-1 codes with their own country= directory by default (the near corridor);
+# every other country shares OTHER_COUNTRY_PARTITION so small countries don't end up in tiny files
+DEFAULT_COUNTRY_PARTITIONS = tuple(sorted({to_iso1(c) for c in NEAR}))
+OTHER_COUNTRY_PARTITION = "_other"
+
+
+def parse_country_partitions(text: str) -> Tuple[str, ...]:
+    """argparse type for --country-partitions: comma-separated ISO-1 country codes."""
+    codes = tuple(c.strip().upper() for c in text.split(",") if c.strip())
+    if not codes or len(set(codes)) != len(codes) or OTHER_COUNTRY_PARTITION.upper() in codes:
+        raise argparse.ArgumentTypeError(f"expected distinct ISO-1 country codes, e.g. D,F,I, got {text!r}")
+    return codes
+
+
+# columns that get a split-block bloom filter per row group with --bloom-filter-fpp
+# (plates carry their country as prefix, so a country+plate key would add nothing)
+BLOOM_FILTER_COLUMNS = ("license_plate",)
+
+
+@dataclass(frozen=True)
+class ParquetLayout:
+    """
+    How rows are laid out in the Parquet parts (S3 and localfs sinks).
+    - sort_by: reorder each part by these columns and declare them as the file's sorting_columns,
+      so row-group min/max statistics on them are tight (default: keep the ingest/ts order)
+    - row_group_rows: rows per row group, the unit readers skip using those statistics
+    - bloom_fpp: false-positive rate of the bloom filters on BLOOM_FILTER_COLUMNS (None: no filters)
+    - country_partitions: ISO-1 codes that get their own country= directory below date=; all other
+      countries go to country=_other (empty: no country level)
+    - file_bytes: write a day (or streamed slice) as one part regardless of chunk_rows and start a new file
+      whenever the current one reaches this size, cut at row-group boundaries; the files are named
+      part-NNNNN-KKK.parquet (None: parts of chunk_rows rows, one part-NNNNN.parquet each)
+    - page_bytes: target size of a data page, the unit a reader decodes (None: Arrow's 1 MiB)
+    """
+
+    sort_by: Tuple[str, ...] = ()
+    row_group_rows: int = 250_000
+    bloom_fpp: Optional[float] = None
+    country_partitions: Tuple[str, ...] = ()
+    file_bytes: Optional[int] = None
+    page_bytes: Optional[int] = None
+
+    def part_rows(self, chunk_rows: int, incoming, outgoing) -> int:
+        """Rows per part of a day: chunk_rows, or with file_bytes the whole day so only the size cuts files."""
+        if self.file_bytes is None:
+            return chunk_rows
+        return max(len(incoming), len(outgoing), 1)
+
+    def file_path(self, path: str, k: int) -> str:
+        """Path (or key) of the k-th file of the part at path."""
+        if self.file_bytes is None:
+            return path
+        return f"{path[:-len('.parquet')]}-{k:03d}.parquet"
+
+    def country_parts(self, table: pa.Table) -> List[Tuple[Optional[str], pa.Table]]:
+        """Split a part into (country= value, rows) per country bucket, keeping row order; (None, table) without."""
+        if not self.country_partitions:
+            return [(None, table)]
+        country = table["country_of_registration"].unify_dictionaries().combine_chunks()
+        names = [c if c in self.country_partitions else OTHER_COUNTRY_PARTITION for c in country.dictionary.to_pylist()]
+        buckets = sorted(set(names))
+        bucket = pa.array([buckets.index(n) for n in names], type=pa.int32()).take(country.indices)
+        parts = [(name, table.filter(pc.equal(bucket, i))) for i, name in enumerate(buckets)]
+        return [(name, rows) for name, rows in parts if rows.num_rows]
+
+    def prepare(self, table: pa.Table) -> pa.Table:
+        if not self.sort_by:
+            return table
+        keys = pa.table({c: sort_key(table[c]) for c in self.sort_by})
+        return table.take(pc.sort_indices(keys, sort_keys=[(c, "ascending") for c in self.sort_by]))
+
+    def write_options(self, table: pa.Table) -> dict:
+        options = dict(PARQUET_WRITE_OPTIONS)
+        if self.sort_by:
+            options["sorting_columns"] = [pq.SortingColumn(table.schema.get_field_index(c)) for c in self.sort_by]
+        if self.bloom_fpp is not None:
+            # sized for a row group of distinct plates; filters are written per row group
+            ndv = max(min(self.row_group_rows, table.num_rows), 1)
+            options["bloom_filter_options"] = {c: {"ndv": ndv, "fpp": self.bloom_fpp} for c in BLOOM_FILTER_COLUMNS}
+        if self.page_bytes is not None:
+            options["data_page_size"] = self.page_bytes
+        return options
+
+
+def write_part_files(table: pa.Table, layout: ParquetLayout, open_file: Callable[[int], pa.NativeFile]) -> int:
+    """
+    Encode a prepared part into open_file(0), open_file(1), ... one row group at a time: a single file,
+    or with layout.file_bytes a new file whenever the current one has reached that size.
+    Returns the bytes written.
+    """
+    options = layout.write_options(table)
+    nbytes, offset, k = 0, 0, 0
+    while k == 0 or offset < table.num_rows:
+        with open_file(k) as out:
+            with pq.ParquetWriter(out, table.schema, **options) as writer:
+                while offset < table.num_rows:
+                    writer.write_table(table.slice(offset, layout.row_group_rows), row_group_size=layout.row_group_rows)
+                    offset += layout.row_group_rows
+                    if layout.file_bytes is not None and out.tell() >= layout.file_bytes:
+                        break
+            nbytes += out.tell()
+        k += 1
+    return nbytes
+
+
+def write_parquet_to_s3(
+    s3,
+    cfg: S3Config,
+    df: Union[pd.DataFrame, pa.Table],
+    direction: str,
+    day: date,
+    part: int,
+    transfer: Optional[TransferConfig] = None,
+    metrics: Optional[StageMetrics] = None,
+    layout: ParquetLayout = ParquetLayout(),
+    country: Optional[str] = None,
+) -> int:
+    """Encode one part (one or more files) and upload it; returns the number of bytes uploaded."""
+    key = part_key(cfg, direction, day, part, country)
+
+    t0 = time.perf_counter()
+    rss0 = peak_rss_bytes()
+    table = layout.prepare(as_table(df))
+    sinks: List[pa.BufferOutputStream] = []
+
+    def open_buffer(k: int) -> pa.BufferOutputStream:
+        sinks.append(pa.BufferOutputStream())
+        return sinks[-1]
+
+    write_part_files(table, layout, open_buffer)
+    # upload straight from the Arrow buffers (no copy into Python bytes)
+    bufs = [sink.getvalue() for sink in sinks]
+    nbytes = sum(buf.size for buf in bufs)
+
+    t1 = time.perf_counter()
+    rss1 = peak_rss_bytes()
+    for k, buf in enumerate(bufs):
+        if transfer is None:
+            s3.put_object(Bucket=cfg.bucket, Key=layout.file_path(key, k), Body=pa.BufferReader(buf))
+        else:
+            s3.upload_fileobj(pa.BufferReader(buf), cfg.bucket, layout.file_path(key, k), Config=transfer)
+    if metrics is not None:
+        metrics.add(day, "parquet_encode", t1 - t0, table.num_rows, nbytes, rss1 - rss0)
+        metrics.add(day, "upload", time.perf_counter() - t1, table.num_rows, nbytes, rss_growth(rss1))
+    return nbytes
+
+
+def stream_parquet_to_s3(
+    fs: pafs.S3FileSystem,
+    cfg: S3Config,
+    df: Union[pd.DataFrame, pa.Table],
+    direction: str,
+    day: date,
+    part: int,
+    metrics: Optional[StageMetrics] = None,
+    layout: ParquetLayout = ParquetLayout(),
+    country: Optional[str] = None,
+) -> int:
+    """
+    Encode one part straight into an S3 output stream: each row group is flushed
+    to the stream as soon as it is encoded and the stream uploads it in multipart
+    chunks, so the encoded file is never held in memory as a whole.
+    Returns the number of bytes written.
+    """
+    t0 = time.perf_counter()
+    rss0 = peak_rss_bytes()
+    nbytes = write_parquet_file(fs, f"{cfg.bucket}/{part_key(cfg, direction, day, part, country)}", df, layout)
+    if metrics is not None:
+        # encoding and upload overlap in a stream, so they are one stage here
+        metrics.add(day, "parquet_stream", time.perf_counter() - t0, len(df), nbytes, rss_growth(rss0))
+    return nbytes
+
+
+def write_parquet_file(
+    fs: pafs.FileSystem,
+    path: str,
+    df: Union[pd.DataFrame, pa.Table],
+    layout: ParquetLayout = ParquetLayout(),
+) -> int:
+    """Encode one part into output streams of any Arrow filesystem; returns bytes written."""
+    table = layout.prepare(as_table(df))
+    return write_part_files(table, layout, lambda k: fs.open_output_stream(layout.file_path(path, k)))
+
+
+# -----------------------------
+# COPY payload encoding from Arrow buffers (text and binary)
+# -----------------------------
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+PG_EPOCH_US = 946_684_800_000_000  # 2000-01-01T00:00:00Z in Unix microseconds
+
+
+def fixed_width_binary(values: np.ndarray) -> pa.Array:
+    """Expose each element of a (structured) numpy array as one binary value, without copying per row."""
+    width = values.dtype.itemsize
+    buf = pa.py_buffer(np.ascontiguousarray(values).tobytes())
+    return pa.FixedSizeBinaryArray.from_buffers(pa.binary(width), len(values), [None, buf]).cast(pa.binary())
+
+
+def joined_data(rows: pa.Array) -> pa.Buffer:
+    """The contiguous value bytes of a (binary or string) array, i.e. all rows back to back."""
+    _, offsets, data = rows.buffers()
+    bounds = np.frombuffer(offsets, dtype=np.int32, count=rows.offset + len(rows) + 1)[[rows.offset, -1]]
+    return data[int(bounds[0]):int(bounds[1])]
+
+
+def copy_binary_field(column) -> pa.Array:
+    """Length-prefixed COPY BINARY field bytes for a text column (plain or dictionary-encoded)."""
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    if pa.types.is_dictionary(column.type):
+        # encode each distinct value once, then gather by index
+        entries = [v.encode() for v in column.dictionary.to_pylist()]
+        fields = pa.array([struct.pack(">i", len(b)) + b for b in entries], type=pa.binary())
+        return fields.take(column.indices)
+    values = column.cast(pa.binary())
+    lengths = pc.binary_length(values).to_numpy(zero_copy_only=False).astype(">i4")
+    return pc.binary_join_element_wise(fixed_width_binary(lengths), values, b"")
 
-def insert_postgres_copy(conn, table: str, df: pd.DataFrame):
-    cols = [
-        "ts",
-        "country_of_registration",
-        "license_plate",
-        "vehicle_type",
-        "colour",
-        "brand",
-        "location_of_crossing",
-    ]
-    data = df[cols]
 
+def encode_copy_binary(df: Union[pd.DataFrame, pa.Table]) -> bytes:
+    """
+    Encode a chunk as a complete COPY BINARY payload (header, tuples, trailer).
+    Works column-at-a-time: ts becomes big-endian int64 microseconds since 2000-01-01,
+    text columns become int32 length + UTF-8 bytes, and the rows are stitched together
+    with one element-wise binary join.
+    """
+    table = as_table(df)
+    n = table.num_rows
+    ts_us = table["ts"].cast(ARROW_TS_TYPE).cast(pa.int64()).to_numpy()
+
+    head = np.empty(n, dtype=[("nfields", ">i2"), ("ts_len", ">i4"), ("ts", ">i8")])
+    head["nfields"] = len(EVENT_COLUMNS)
+    head["ts_len"] = 8
+    head["ts"] = ts_us - PG_EPOCH_US
+
+    fields = [fixed_width_binary(head)] + [copy_binary_field(table[c]) for c in EVENT_COLUMNS[1:]]
+    rows = pc.binary_join_element_wise(*fields, b"")
+    body = joined_data(rows) if n else b""
+    return b"".join([PGCOPY_HEADER, memoryview(body), PGCOPY_TRAILER])
+
+
+def escape_copy_text(values: pa.Array) -> pa.Array:
+    """Apply COPY text escaping (backslash first, then the delimiter and line breaks)."""
+    for raw, escaped in (("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r")):
+        values = pc.replace_substring(values, raw, escaped)
+    return values
+
+
+def copy_text_field(column) -> pa.Array:
+    """Escaped COPY text field for a string column (plain or dictionary-encoded)."""
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    if pa.types.is_dictionary(column.type):
+        return escape_copy_text(column.dictionary.cast(pa.string())).take(column.indices)
+    return escape_copy_text(column.cast(pa.string()))
+
+
+def encode_copy_text(df: Union[pd.DataFrame, pa.Table]) -> bytes:
+    """Encode a chunk as a COPY text payload: tab-separated fields, one line per row."""
+    table = as_table(df)
+    if table.num_rows == 0:
+        return b""
+    ts = pc.strftime(table["ts"].cast(ARROW_TS_TYPE).combine_chunks(), format="%Y-%m-%dT%H:%M:%S%z")
+    fields = [ts] + [copy_text_field(table[c]) for c in EVENT_COLUMNS[1:]]
+    rows = pc.binary_join_element_wise(*fields, "\t")
+    lines = pc.binary_join_element_wise(rows, pa.scalar("\n"), "")
+    return bytes(joined_data(lines))
+
+
+def encode_copy_payload(df: Union[pd.DataFrame, pa.Table], copy_format: str = "text") -> bytes:
+    if copy_format == "binary":
+        return encode_copy_binary(df)
+    return encode_copy_text(df)
+
+
+def send_copy_payload(conn, table: str, payload: bytes, copy_format: str = "text"):
+    """Stream an already encoded COPY payload to one connection."""
+    options = " (FORMAT BINARY)" if copy_format == "binary" else ""
     with conn.cursor() as cur:
-        with cur.copy(f"COPY {table} ({', '.join(cols)}) FROM STDIN") as copy:
-            for row in data.itertuples(index=False, name=None):
-                ts = row[0].isoformat()
-                copy.write_row((ts, *row[1:]))
+        with cur.copy(f"COPY {table} ({', '.join(EVENT_COLUMNS)}) FROM STDIN{options}") as copy:
+            copy.write(payload)
 
 
 # -----------------------------
@@ -354,6 +1259,74 @@ def make_standout_pool(
     return commuters, chilled, smugglers
 
 
+def commuter_events(
+    rng: np.random.Generator,
+    day_start: datetime,
+    commuters: pd.DataFrame,
+    missing_prob: float,
+    legacy: bool = False,
+) -> Tuple[List[pd.DataFrame], List[pd.DataFrame]]:
+    """Weekday commuter crossings (in 05:00-10:00, out 15:00-20:00); nothing on weekends."""
+    # --- inject commuters: weekday pattern (Mon-Fri mostly) ---
+    weekday = day_start.weekday()  # 0=Mon
+    if weekday > 4:
+        return [], []
+
+    def to_ts(secs: np.ndarray):
+        if legacy:
+            return [day_start + timedelta(seconds=int(s)) for s in secs]
+        return seconds_to_ts(day_start, secs)
+
+    # each commuter: typically 1 in + 1 out, sometimes extra
+    n = len(commuters)
+    # In morning 05:00-10:00, out 15:00-20:00
+    in_secs = rng.integers(5 * 3600, 10 * 3600, size=n)
+    out_secs = rng.integers(15 * 3600, 20 * 3600, size=n)
+
+    # some missing (e.g. drove through, sensor miss)
+    keep_in = rng.random(size=n) > missing_prob
+    keep_out = rng.random(size=n) > missing_prob
+
+    in_df = commuters.loc[keep_in].copy()
+    out_df = commuters.loc[keep_out].copy()
+
+    in_df["ts"] = to_ts(in_secs[keep_in])
+    out_df["ts"] = to_ts(out_secs[keep_out])
+
+    if legacy:
+        in_df["location_of_crossing"] = [
+            choose_crossing(rng, c) for c in in_df["country_of_registration"].to_numpy()
+        ]
+        out_df["location_of_crossing"] = [
+            choose_crossing(rng, c) for c in out_df["country_of_registration"].to_numpy()
+        ]
+    else:
+        in_df["location_of_crossing"] = bulk_crossings(rng, in_df["country_of_registration"].to_numpy())
+        out_df["location_of_crossing"] = bulk_crossings(rng, out_df["country_of_registration"].to_numpy())
+
+    return [in_df[EVENT_COLUMNS]], [out_df[EVENT_COLUMNS]]
+
+
+def bulk_day_standouts(
+    rng: np.random.Generator,
+    day_start: datetime,
+    commuters: pd.DataFrame,
+    chilled: pd.DataFrame,
+    smugglers: pd.DataFrame,
+    missing_prob: float,
+) -> Tuple[List[pd.DataFrame], List[pd.DataFrame]]:
+    """All injected standout rows of a day (commuters, chilled trucks, smugglers) as (incoming, outgoing) frames."""
+    extra_in, extra_out = commuter_events(rng, day_start, commuters, missing_prob)
+    # --- chilled logistics trucks: 2..6 alternating hops; smugglers: 6..19 random ---
+    chilled_in, chilled_out = bulk_standout_events(
+        rng, day_start, chilled, 0.35, (2, 7), missing_prob, alternate=True
+    )
+    smugglers_in, smugglers_out = bulk_standout_events(
+        rng, day_start, smugglers, 0.25, (6, 20), missing_prob * 1.2, alternate=False
+    )
+    return extra_in + [chilled_in, smugglers_in], extra_out + [chilled_out, smugglers_out]
+
+
 def generate_day_events(
     rng: np.random.Generator,
     day_start: datetime,
@@ -367,15 +1340,24 @@ def generate_day_events(
     missing_prob: float,
     misplace_per_day: int,
     misplace_max_offset: int,
-) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    legacy: bool = False,
+    as_arrow: bool = False,
+    timings: Optional[Dict[str, float]] = None,
+) -> Tuple[Union[pd.DataFrame, pa.Table], Union[pd.DataFrame, pa.Table]]:
     """
     Generate IN and OUT events for the day.
     - baseline: random independent samples for IN and OUT
     - standout injections: commuters + chilled + smugglers add extra crossings
     - missing_prob: some vehicles may have only IN or only OUT within the day (naturally)
+    - legacy: use the original per-row baseline generator (slow, kept for comparison)
+    - as_arrow: return pyarrow Tables (ARROW_SCHEMA) instead of pandas DataFrames
+    - timings: if given, receives the seconds spent assembling and time-ordering the day ("sort")
+      and how far that raised the peak RSS ("sort_rss")
     """
 
     def baseline_events(n: int) -> pd.DataFrame:
+        if not legacy:
+            return vectorized_baseline_events(rng, day_start, n, countries, weights)
         cc = rng.choice(countries, size=n, p=weights)
         plates = np.array([random_plate(rng, c) for c in cc])
         vtypes = choose_vehicle_type(rng, n)
@@ -399,103 +1381,1343 @@ def generate_day_events(
             }
         )
 
-    incoming = baseline_events(incoming_target)
-    outgoing = baseline_events(outgoing_target)
+    if as_arrow:
+        incoming = arrow_baseline_events(rng, day_start, incoming_target, countries, weights)
+        outgoing = arrow_baseline_events(rng, day_start, outgoing_target, countries, weights)
+    else:
+        incoming = baseline_events(incoming_target)
+        outgoing = baseline_events(outgoing_target)
 
     extra_in_rows: List[Dict[str, object]] = []
     extra_out_rows: List[Dict[str, object]] = []
 
-    # --- inject commuters: weekday pattern (Mon-Fri mostly) ---
-    weekday = day_start.weekday()  # 0=Mon
-    if weekday <= 4:
-        # each commuter: typically 1 in + 1 out, sometimes extra
-        n = len(commuters)
-        # In morning 05:00-10:00, out 15:00-20:00
-        in_secs = rng.integers(5 * 3600, 10 * 3600, size=n)
-        out_secs = rng.integers(15 * 3600, 20 * 3600, size=n)
+    if legacy:
+        extra_in, extra_out = commuter_events(rng, day_start, commuters, missing_prob, legacy=True)
+
+        # --- inject chilled logistics trucks: multiple border hops per week ---
+        if len(chilled) > 0:
+            active = rng.random(size=len(chilled)) < 0.35  # 35% active each day
+            active_df = chilled.loc[active].copy()
+            for _, v in active_df.iterrows():
+                k = int(rng.integers(2, 7))  # 2..6 crossings
+                secs = rng.integers(0, 86400, size=k)
+                dirs = ["incoming" if i % 2 == 0 else "outgoing" for i in range(k)]
+                for s, ddir in zip(secs, dirs):
+                    if rng.random() < missing_prob:
+                        continue
+                    row = {
+                        "ts": day_start + timedelta(seconds=int(s)),
+                        "country_of_registration": v["country_of_registration"],
+                        "license_plate": v["license_plate"],
+                        "vehicle_type": v["vehicle_type"],
+                        "colour": v["colour"],
+                        "brand": v["brand"],
+                        "location_of_crossing": choose_crossing(rng, v["country_of_registration"]),
+                    }
+                    if ddir == "incoming":
+                        extra_in_rows.append(row)
+                    else:
+                        extra_out_rows.append(row)
+
+        # --- inject smugglers: very high + irregular crossings ---
+        if len(smugglers) > 0:
+            active = rng.random(size=len(smugglers)) < 0.25  # 25% active each day
+            active_df = smugglers.loc[active].copy()
+            for _, v in active_df.iterrows():
+                k = int(rng.integers(6, 20))  # 6..19 crossings/day
+                secs = rng.integers(0, 86400, size=k)
+                dirs = rng.choice(["incoming", "outgoing"], size=k, p=[0.5, 0.5])
+                for s, ddir in zip(secs, dirs):
+                    if rng.random() < (missing_prob * 1.2):
+                        continue
+                    row = {
+                        "ts": day_start + timedelta(seconds=int(s)),
+                        "country_of_registration": v["country_of_registration"],
+                        "license_plate": v["license_plate"],
+                        "vehicle_type": v["vehicle_type"],
+                        "colour": v["colour"],
+                        "brand": v["brand"],
+                        "location_of_crossing": choose_crossing(rng, v["country_of_registration"]),
+                    }
+                    if ddir == "incoming":
+                        extra_in_rows.append(row)
+                    else:
+                        extra_out_rows.append(row)
+    else:
+        extra_in, extra_out = bulk_day_standouts(rng, day_start, commuters, chilled, smugglers, missing_prob)
 
-        # some missing (e.g. drove through, sensor miss)
-        keep_in = rng.random(size=n) > missing_prob
-        keep_out = rng.random(size=n) > missing_prob
+    if extra_in_rows:
+        extra_in.append(pd.DataFrame(extra_in_rows))
+    if extra_out_rows:
+        extra_out.append(pd.DataFrame(extra_out_rows))
+
+    t_sort = time.perf_counter()
+    rss_sort = peak_rss_bytes()
+    in_order = out_order = None
+    if legacy:
+        incoming = pd.concat([incoming] + extra_in, ignore_index=True).sort_values("ts").reset_index(drop=True)
+        outgoing = pd.concat([outgoing] + extra_out, ignore_index=True).sort_values("ts").reset_index(drop=True)
+    else:
+        # the baseline is already in time order: append the injected rows and merge them in
+        n_in, n_out = len(incoming), len(outgoing)
+        if as_arrow:
+            incoming = pa.concat_tables([incoming] + [frame_to_table(f, countries) for f in extra_in])
+            outgoing = pa.concat_tables([outgoing] + [frame_to_table(f, countries) for f in extra_out])
+        else:
+            incoming = pd.concat([incoming] + [categorize_frame(f, countries) for f in extra_in], ignore_index=True)
+            outgoing = pd.concat([outgoing] + [categorize_frame(f, countries) for f in extra_out], ignore_index=True)
+            # keep ts as a native datetime column
+            incoming["ts"] = incoming["ts"].astype(TS_DTYPE)
+            outgoing["ts"] = outgoing["ts"].astype(TS_DTYPE)
+        in_ts, out_ts = ts_us(incoming), ts_us(outgoing)
+        in_order = merge_order(in_ts[:n_in], in_ts[n_in:])
+        out_order = merge_order(out_ts[:n_out], out_ts[n_out:])
+        del in_ts, out_ts
+    if timings is not None:
+        timings["sort"] = time.perf_counter() - t_sort
+        timings["sort_rss"] = rss_growth(rss_sort)
+
+    # the merge order is applied together with the misplacements, in one take per direction
+    if as_arrow:
+        in_perm = ingest_order(rng, len(incoming), misplace_per_day, misplace_max_offset, in_order)
+        out_perm = ingest_order(rng, len(outgoing), misplace_per_day, misplace_max_offset, out_order)
+        # hand over the columns instead of the tables, so each source column is freed once it is taken
+        in_cols, out_cols = incoming.columns, outgoing.columns
+        incoming = outgoing = None
+        return take_columns(in_cols, in_perm), take_columns(out_cols, out_perm)
+
+    incoming = apply_ingest_misplacements(rng, incoming, misplace_per_day, misplace_max_offset, in_order)
+    outgoing = apply_ingest_misplacements(rng, outgoing, misplace_per_day, misplace_max_offset, out_order)
 
-        in_df = commuters.loc[keep_in].copy()
-        out_df = commuters.loc[keep_out].copy()
+    return incoming, outgoing
 
-        in_df["ts"] = [day_start + timedelta(seconds=int(s)) for s in in_secs[keep_in]]
-        out_df["ts"] = [day_start + timedelta(seconds=int(s)) for s in out_secs[keep_out]]
 
-        in_df["location_of_crossing"] = [
-            choose_crossing(rng, c) for c in in_df["country_of_registration"].to_numpy()
-        ]
-        out_df["location_of_crossing"] = [
-            choose_crossing(rng, c) for c in out_df["country_of_registration"].to_numpy()
-        ]
+# -----------------------------
+# Per-day seeding and day-parallel generation
+# -----------------------------
+@dataclass
+class DayGenConfig:
+    countries: np.ndarray
+    weights: np.ndarray
+    commuters: pd.DataFrame
+    chilled: pd.DataFrame
+    smugglers: pd.DataFrame
+    avg_in_per_day: int
+    avg_out_per_day: int
+    day_jitter: float
+    missing_prob: float
+    misplace_per_day: int
+    misplace_max_offset: int
+    legacy: bool = False
+    as_arrow: bool = False
+
+
+def day_seed(seed: int, day: date) -> np.random.SeedSequence:
+    return np.random.SeedSequence(seed, spawn_key=(day.toordinal(),))
+
+
+def day_rng(seed: int, day: date) -> np.random.Generator:
+    """
+    Independent random stream for one calendar day, spawned from --seed.
+    Keyed by the date itself, so a day's events do not depend on which days
+    were generated before it or on how many workers share the run.
+    """
+    return np.random.default_rng(day_seed(seed, day))
 
-        incoming = pd.concat([incoming, in_df[incoming.columns]], ignore_index=True)
-        outgoing = pd.concat([outgoing, out_df[outgoing.columns]], ignore_index=True)
-
-    # --- inject chilled logistics trucks: multiple border hops per week ---
-    if len(chilled) > 0:
-        active = rng.random(size=len(chilled)) < 0.35  # 35% active each day
-        active_df = chilled.loc[active].copy()
-        for _, v in active_df.iterrows():
-            k = int(rng.integers(2, 7))  # 2..6 crossings
-            secs = rng.integers(0, 86400, size=k)
-            dirs = ["incoming" if i % 2 == 0 else "outgoing" for i in range(k)]
-            for s, ddir in zip(secs, dirs):
-                if rng.random() < missing_prob:
-                    continue
-                row = {
-                    "ts": day_start + timedelta(seconds=int(s)),
-                    "country_of_registration": v["country_of_registration"],
-                    "license_plate": v["license_plate"],
-                    "vehicle_type": v["vehicle_type"],
-                    "colour": v["colour"],
-                    "brand": v["brand"],
-                    "location_of_crossing": choose_crossing(rng, v["country_of_registration"]),
-                }
-                if ddir == "incoming":
-                    extra_in_rows.append(row)
-                else:
-                    extra_out_rows.append(row)
-
-    # --- inject smugglers: very high + irregular crossings ---
-    if len(smugglers) > 0:
-        active = rng.random(size=len(smugglers)) < 0.25  # 25% active each day
-        active_df = smugglers.loc[active].copy()
-        for _, v in active_df.iterrows():
-            k = int(rng.integers(6, 20))  # 6..19 crossings/day
-            secs = rng.integers(0, 86400, size=k)
-            dirs = rng.choice(["incoming", "outgoing"], size=k, p=[0.5, 0.5])
-            for s, ddir in zip(secs, dirs):
-                if rng.random() < (missing_prob * 1.2):
-                    continue
-                row = {
-                    "ts": day_start + timedelta(seconds=int(s)),
-                    "country_of_registration": v["country_of_registration"],
-                    "license_plate": v["license_plate"],
-                    "vehicle_type": v["vehicle_type"],
-                    "colour": v["colour"],
-                    "brand": v["brand"],
-                    "location_of_crossing": choose_crossing(rng, v["country_of_registration"]),
-                }
-                if ddir == "incoming":
-                    extra_in_rows.append(row)
-                else:
-                    extra_out_rows.append(row)
 
-    if extra_in_rows:
-        incoming = pd.concat([incoming, pd.DataFrame(extra_in_rows)], ignore_index=True)
-    if extra_out_rows:
-        outgoing = pd.concat([outgoing, pd.DataFrame(extra_out_rows)], ignore_index=True)
+def generate_day(cfg: DayGenConfig, seed: int, day_start: datetime):
+    """
+    Generate one ISO-1 coded day. Returns (incoming, outgoing, generation seconds, stats),
+    where stats holds the "sort" and "iso1" seconds and how far each of them and the whole
+    day raised the generating process's peak RSS ("sort_rss", "iso1_rss", "rss").
+    """
+    t0 = time.perf_counter()
+    rss0 = peak_rss_bytes()
+    stats: Dict[str, float] = {}
+    rng = day_rng(seed, day_start.date())
+
+    j = cfg.day_jitter
+    in_target = int(cfg.avg_in_per_day * (1 + rng.uniform(-j, j)))
+    out_target = int(cfg.avg_out_per_day * (1 + rng.uniform(-j, j)))
+
+    incoming, outgoing = generate_day_events(
+        rng=rng,
+        day_start=day_start,
+        incoming_target=in_target,
+        outgoing_target=out_target,
+        countries=cfg.countries,
+        weights=cfg.weights,
+        commuters=cfg.commuters,
+        chilled=cfg.chilled,
+        smugglers=cfg.smugglers,
+        missing_prob=cfg.missing_prob,
+        misplace_per_day=cfg.misplace_per_day,
+        misplace_max_offset=cfg.misplace_max_offset,
+        legacy=cfg.legacy,
+        as_arrow=cfg.as_arrow,
+        timings=stats,
+    )
+    t_iso1 = time.perf_counter()
+    rss_iso1 = peak_rss_bytes()
+    incoming = apply_iso1_codes(incoming)
+    outgoing = apply_iso1_codes(outgoing)
+    stats["iso1"] = time.perf_counter() - t_iso1
+    stats["iso1_rss"] = rss_growth(rss_iso1)
+    stats["rss"] = rss_growth(rss0)
+    return incoming, outgoing, time.perf_counter() - t0, stats
 
-    incoming = incoming.sort_values("ts").reset_index(drop=True)
-    outgoing = outgoing.sort_values("ts").reset_index(drop=True)
 
-    incoming = apply_ingest_misplacements(rng, incoming, misplace_per_day, misplace_max_offset)
-    outgoing = apply_ingest_misplacements(rng, outgoing, misplace_per_day, misplace_max_offset)
+# set once per worker process by the pool initializer (avoids re-pickling the pools per day)
+WORKER_CONFIG: Optional[DayGenConfig] = None
 
-    return incoming, outgoing
+
+def init_generate_worker(cfg: DayGenConfig):
+    global WORKER_CONFIG
+    WORKER_CONFIG = cfg
+
+
+def generate_day_in_worker(seed: int, day_start: datetime):
+    return generate_day(WORKER_CONFIG, seed, day_start)
+
+
+def record_generation(metrics: StageMetrics, day: date, incoming, outgoing, gen_elapsed: float, stats: dict):
+    """Split a day's generation time into the gen, sort and iso1 stages."""
+    rows = len(incoming) + len(outgoing)
+    nbytes = frame_nbytes(incoming) + frame_nbytes(outgoing)
+    sort_rss, iso1_rss = int(stats["sort_rss"]), int(stats["iso1_rss"])
+    gen_rss = max(int(stats["rss"]) - sort_rss - iso1_rss, 0)
+    metrics.add(day, "gen", gen_elapsed - stats["sort"] - stats["iso1"], rows, nbytes, gen_rss)
+    metrics.add(day, "sort", stats["sort"], rows, nbytes, sort_rss)
+    metrics.add(day, "iso1", stats["iso1"], rows, nbytes, iso1_rss)
+
+
+def generate_days(
+    cfg: DayGenConfig,
+    seed: int,
+    day_starts: Sequence[datetime],
+    workers: int = 1,
+    metrics: Optional[StageMetrics] = None,
+) -> Iterator[Tuple[datetime, object, object, float]]:
+    """
+    Yield (day_start, incoming, outgoing, gen_seconds) in date order.
+    With workers > 1 days are generated in a process pool; at most `workers`
+    days are in flight so memory stays bounded while the caller writes.
+    """
+    if workers <= 1:
+        for day_start in day_starts:
+            incoming, outgoing, gen_elapsed, stats = generate_day(cfg, seed, day_start)
+            if metrics is not None:
+                record_generation(metrics, day_start.date(), incoming, outgoing, gen_elapsed, stats)
+            yield day_start, incoming, outgoing, gen_elapsed
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_generate_worker, initargs=(cfg,)
+    ) as pool:
+        todo = iter(day_starts)
+        pending = deque()
+        for day_start in todo:
+            pending.append((day_start, pool.submit(generate_day_in_worker, seed, day_start)))
+            if len(pending) >= workers:
+                break
+        while pending:
+            day_start, fut = pending.popleft()
+            incoming, outgoing, gen_elapsed, stats = fut.result()
+            if metrics is not None:
+                record_generation(metrics, day_start.date(), incoming, outgoing, gen_elapsed, stats)
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(generate_day_in_worker, seed, nxt)))
+            yield day_start, incoming, outgoing, gen_elapsed
+
+
+class DaySlice(NamedTuple):
+    """Rows handed to the writers: a whole day, or one time-ordered slice of a streamed day."""
+
+    day: date
+    incoming: object
+    outgoing: object
+    part: int = 0  # parquet part number of the slice's first chunk
+    last: bool = True  # final slice of the day
+
+
+# -----------------------------
+# Streaming generation: a day as bounded, time-ordered Arrow slices
+# -----------------------------
+STREAM_BLOCK_ROWS = 250_000  # baseline rows sampled per step (independent of --chunk-rows)
+
+
+def sort_by_ts(table: pa.Table) -> pa.Table:
+    return table.take(pc.sort_indices(table["ts"]))
+
+
+def misplaced_slices(blocks: Iterable[pa.Table], moves: Dict[int, int], chunk_rows: int) -> Iterator[pa.Table]:
+    """
+    Re-slice a time-ordered stream of blocks into chunk_rows slices while applying
+    misplacement moves (output position -> source position, see misplacement_moves).
+    Only a window of `reach` rows either side of the current slice is kept, where
+    reach is the largest distance any row moves.
+    """
+    reach = max((abs(src - pos) for pos, src in moves.items()), default=0)
+    window = None
+    window_start = 0  # day position of the window's first row
+    out_pos = 0
+
+    def cut(end: int) -> pa.Table:
+        positions = np.arange(out_pos, end)
+        for pos in (p for p in moves if out_pos <= p < end):
+            positions[pos - out_pos] = moves[pos]
+        return window.take(pa.array(positions - window_start))
+
+    for block in blocks:
+        window = block if window is None else pa.concat_tables([window, block])
+        while window_start + window.num_rows - out_pos >= chunk_rows + reach:
+            end = out_pos + chunk_rows
+            yield cut(end)
+            out_pos = end
+            keep_from = max(out_pos - reach, window_start)
+            window = window.slice(keep_from - window_start)
+            window_start = keep_from
+    while window is not None and out_pos < window_start + window.num_rows:
+        end = min(out_pos + chunk_rows, window_start + window.num_rows)
+        yield cut(end)
+        out_pos = end
+
+
+def stream_direction_events(
+    rng: np.random.Generator,
+    cfg: DayGenConfig,
+    day_start: datetime,
+    n: int,
+    standouts: pa.Table,
+    chunk_rows: int,
+    timings: Dict[str, float],
+) -> Iterator[pa.Table]:
+    """
+    One direction of a streamed day: baseline blocks with the (time-sorted) standout rows
+    merged in by time, then misplaced and cut into slices of at most chunk_rows rows.
+    Accumulates merge/sort seconds into timings["sort"] and their peak RSS growth into timings["sort_rss"].
+    """
+    moves = misplacement_moves(rng, n + standouts.num_rows, cfg.misplace_per_day, cfg.misplace_max_offset)
+    standout_ts = standouts["ts"].cast(pa.int64()).to_numpy()
+
+    def blocks() -> Iterator[pa.Table]:
+        merged = 0  # standout rows already merged
+        produced = 0
+        for secs in stream_sequential_seconds(rng, n, STREAM_BLOCK_ROWS):
+            block = arrow_baseline_events(rng, day_start, len(secs), cfg.countries, cfg.weights, secs=secs)
+            produced += len(secs)
+            t0 = time.perf_counter()
+            rss0 = peak_rss_bytes()
+            if produced == n:
+                upto = len(standout_ts)
+            else:
+                last_ts = day_start_us(day_start) + int(secs[-1]) * 1_000_000
+                upto = int(np.searchsorted(standout_ts, last_ts, side="right"))
+            if upto > merged:
+                extra_ts = standout_ts[merged:upto]
+                block = pa.concat_tables([block, standouts.slice(merged, upto - merged)])
+                base_ts = day_start_us(day_start) + secs.astype(np.int64) * 1_000_000
+                block = block.take(merge_order(base_ts, extra_ts))
+                merged = upto
+            timings["sort"] += time.perf_counter() - t0
+            timings["sort_rss"] += rss_growth(rss0)
+            yield block
+        if n == 0 and standouts.num_rows:
+            yield standouts
+
+    return misplaced_slices(blocks(), moves, chunk_rows)
+
+
+def stream_day(
+    cfg: DayGenConfig,
+    seed: int,
+    day_start: datetime,
+    chunk_rows: int,
+    timings: Dict[str, float],
+) -> Iterator[Tuple[pa.Table, pa.Table]]:
+    """
+    Generate one ISO-1 coded day as (incoming, outgoing) Arrow slices of at most chunk_rows
+    rows each, in time order, holding roughly one block plus one slice per direction in memory.
+    Same distributions as generate_day; the random streams differ, so rows are not identical.
+    """
+    setup, in_seed, out_seed = day_seed(seed, day_start.date()).spawn(3)
+    rng = np.random.default_rng(setup)
+    j = cfg.day_jitter
+    in_target = int(cfg.avg_in_per_day * (1 + rng.uniform(-j, j)))
+    out_target = int(cfg.avg_out_per_day * (1 + rng.uniform(-j, j)))
+
+    extra_in, extra_out = bulk_day_standouts(
+        rng, day_start, cfg.commuters, cfg.chilled, cfg.smugglers, cfg.missing_prob
+    )
+    t0 = time.perf_counter()
+    rss0 = peak_rss_bytes()
+    standouts = [
+        sort_by_ts(pa.concat_tables([ARROW_SCHEMA.empty_table()] + [frame_to_table(f, cfg.countries) for f in extra]))
+        for extra in (extra_in, extra_out)
+    ]
+    timings["sort"] += time.perf_counter() - t0
+    timings["sort_rss"] += rss_growth(rss0)
+
+    streams = [
+        stream_direction_events(np.random.default_rng(s), cfg, day_start, n, rows, chunk_rows, timings)
+        for s, n, rows in ((in_seed, in_target, standouts[0]), (out_seed, out_target, standouts[1]))
+    ]
+    empty = ARROW_SCHEMA.empty_table()
+    emitted = False
+    for incoming, outgoing in zip_longest(*streams):
+        t0 = time.perf_counter()
+        rss0 = peak_rss_bytes()
+        incoming = apply_iso1_codes(incoming) if incoming is not None else empty
+        outgoing = apply_iso1_codes(outgoing) if outgoing is not None else empty
+        timings["iso1"] += time.perf_counter() - t0
+        timings["iso1_rss"] += rss_growth(rss0)
+        emitted = True
+        yield incoming, outgoing
+    if not emitted:
+        yield empty, empty
+
+
+def stream_days(
+    cfg: DayGenConfig,
+    seed: int,
+    day_starts: Sequence[datetime],
+    chunk_rows: int,
+    metrics: Optional[StageMetrics] = None,
+) -> Iterator[Tuple[DaySlice, float]]:
+    """
+    Yield (slice, gen_seconds) for every streamed slice of every day, in time order.
+    Slices are produced one ahead so the last slice of a day is flagged.
+    """
+    for day_start in day_starts:
+        day = day_start.date()
+        timings = {"sort": 0.0, "iso1": 0.0, "sort_rss": 0.0, "iso1_rss": 0.0}
+        slices = stream_day(cfg, seed, day_start, chunk_rows, timings)
+
+        def pull():
+            before = dict(timings)
+            t0 = time.perf_counter()
+            rss0 = peak_rss_bytes()
+            item = next(slices, None)
+            stats = {k: timings[k] - before[k] for k in timings}
+            stats["rss"] = rss_growth(rss0)
+            return item, time.perf_counter() - t0, stats
+
+        item, elapsed, stats = pull()
+        part = 0
+        while item is not None:
+            nxt, nxt_elapsed, nxt_stats = pull()
+            incoming, outgoing = item
+            if metrics is not None:
+                record_generation(metrics, day, incoming, outgoing, elapsed, stats)
+            yield DaySlice(day, incoming, outgoing, part=part, last=nxt is None), elapsed
+            item, elapsed, stats = nxt, nxt_elapsed, nxt_stats
+            part += 1
+
+
+# -----------------------------
+# Day writers and the generate/write pipeline
+# -----------------------------
+DIRECTIONS = ("incoming", "outgoing")
+
+
+def encode_copy_chunks(table: str, df, chunk_rows: int, copy_format: str) -> List[Tuple[str, bytes]]:
+    """Encode one direction of a day into (table, COPY payload) chunks."""
+    return [
+        (table, encode_copy_payload(slice_rows(df, off, chunk_rows), copy_format))
+        for off in range(0, len(df), chunk_rows)
+    ]
+
+
+class SharedCopyPayloads:
+    """
+    COPY payloads per (day, direction, part) shared by all Postgres targets: the first target
+    to reach one encodes it, the others wait for and reuse the same buffers, and it is
+    dropped once every target has released it (sent or skipped). Mirrors then cost
+    network time only, not another encode.
+    """
+
+    def __init__(self, targets: int, chunk_rows: int, copy_format: str, metrics: Optional[StageMetrics] = None):
+        self.targets = targets
+        self.chunk_rows = chunk_rows
+        self.copy_format = copy_format
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[date, str, int], list] = {}  # key -> [Future or None, released count]
+
+    def acquire(self, key: Tuple[date, str, int], table: str, df) -> List[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.setdefault(key, [None, 0])
+            owner = entry[0] is None
+            if owner:
+                entry[0] = Future()
+        fut = entry[0]
+        if owner:
+            t0 = time.perf_counter()
+            rss0 = peak_rss_bytes()
+            try:
+                payloads = encode_copy_chunks(table, df, self.chunk_rows, self.copy_format)
+            except BaseException as exc:
+                fut.set_exception(exc)
+            else:
+                if self.metrics is not None:
+                    nbytes = sum(len(payload) for _, payload in payloads)
+                    elapsed = time.perf_counter() - t0
+                    self.metrics.add(key[0], "copy_encode", elapsed, len(df), nbytes, rss_growth(rss0))
+                fut.set_result(payloads)
+        return fut.result()
+
+    def release(self, key: Tuple[date, str, int]):
+        with self._lock:
+            entry = self._entries.setdefault(key, [None, 0])
+            entry[1] += 1
+            if entry[1] == self.targets:
+                del self._entries[key]
+
+
+def write_day_pg(pg_conns, payloads: List[Tuple[str, bytes]], copy_format: str = "text") -> int:
+    """Send encoded chunks to every connection; returns bytes sent."""
+    for table, payload in payloads:
+        for conn in pg_conns:
+            send_copy_payload(conn, table, payload, copy_format)
+    return sum(len(payload) for _, payload in payloads) * len(pg_conns)
+
+
+def write_day_s3(
+    s3,
+    cfg: S3Config,
+    day: date,
+    incoming,
+    outgoing,
+    chunk_rows: int,
+    pool: Optional[ThreadPoolExecutor] = None,
+    fs: Optional[pafs.S3FileSystem] = None,
+    metrics: Optional[StageMetrics] = None,
+    first_part: int = 0,
+    layout: ParquetLayout = ParquetLayout(),
+) -> int:
+    """
+    Write all parts of a day; with a pool, parts are encoded and uploaded concurrently.
+    With an Arrow filesystem, parts are streamed instead of buffered (see stream_parquet_to_s3).
+    Parts are numbered from first_part (streamed slices continue the day's numbering).
+    With a country level, each part is written as one file per country bucket under the same number.
+    """
+    transfer = s3_transfer_config(cfg)
+
+    def write_part(df, direction: str, part: int) -> int:
+        nbytes = 0
+        for country, rows in layout.country_parts(as_table(df)):
+            if fs is not None:
+                nbytes += stream_parquet_to_s3(fs, cfg, rows, direction, day, part, metrics, layout, country)
+            else:
+                nbytes += write_parquet_to_s3(s3, cfg, rows, direction, day, part, transfer, metrics, layout, country)
+        return nbytes
+
+    part_rows = layout.part_rows(chunk_rows, incoming, outgoing)
+    return write_parts(write_part, day_parts(incoming, outgoing, part_rows, first_part), pool)
+
+
+def day_parts(incoming, outgoing, chunk_rows: int, first_part: int = 0) -> List[Tuple[object, str, int]]:
+    """Split a day into (rows, direction, part number) jobs of at most chunk_rows rows."""
+    jobs = []
+    part = first_part
+    for off in range(0, max(len(incoming), len(outgoing)), chunk_rows):
+        if off < len(incoming):
+            jobs.append((slice_rows(incoming, off, chunk_rows), "incoming", part))
+        if off < len(outgoing):
+            jobs.append((slice_rows(outgoing, off, chunk_rows), "outgoing", part))
+        part += 1
+    return jobs
+
+
+def write_parts(
+    write_part: Callable[[object, str, int], int],
+    jobs: List[Tuple[object, str, int]],
+    pool: Optional[ThreadPoolExecutor] = None,
+) -> int:
+    if pool is None:
+        return sum(write_part(df, d, p) for df, d, p in jobs)
+    futures = [pool.submit(write_part, df, d, p) for df, d, p in jobs]
+    return sum(f.result() for f in futures)
+
+
+def write_day_localfs(
+    root: str,
+    day: date,
+    incoming,
+    outgoing,
+    chunk_rows: int,
+    pool: Optional[ThreadPoolExecutor] = None,
+    metrics: Optional[StageMetrics] = None,
+    first_part: int = 0,
+    layout: ParquetLayout = ParquetLayout(),
+) -> int:
+    """
+    Write a day as the same hive layout as S3 (direction=/date=/part-*.parquet, with --partition-country
+    direction=/date=/country=/part-*.parquet) under a local directory.
+    """
+    fs = pafs.LocalFileSystem()
+    for direction, df in (("incoming", incoming), ("outgoing", outgoing)):
+        if len(df):
+            fs.create_dir(hive_day_dir(root, direction, day), recursive=True)
+
+    def write_part(df, direction: str, part: int) -> int:
+        t0 = time.perf_counter()
+        rss0 = peak_rss_bytes()
+        nbytes = 0
+        for country, rows in layout.country_parts(as_table(df)):
+            path = hive_part_path(root, direction, day, part, country)
+            if country is not None:
+                fs.create_dir(os.path.dirname(path), recursive=True)
+            nbytes += write_parquet_file(fs, path, rows, layout)
+        if metrics is not None:
+            metrics.add(day, "localfs_write", time.perf_counter() - t0, len(df), nbytes, rss_growth(rss0))
+        return nbytes
+
+    part_rows = layout.part_rows(chunk_rows, incoming, outgoing)
+    return write_parts(write_part, day_parts(incoming, outgoing, part_rows, first_part), pool)
+
+
+def write_day_null(piece: DaySlice) -> int:
+    """Discard the rows (measures generation throughput without any sink)."""
+    return 0
+
+
+def pg_label(dsn: str) -> str:
+    info = conninfo_to_dict(dsn)
+    return f"{info.get('host', 'localhost')}:{info.get('port', 5432)}/{info.get('dbname', '')}"
+
+
+def mb_per_s(nbytes: int, seconds: float) -> float:
+    return nbytes / 1e6 / seconds if seconds > 0 else 0.0
+
+
+# writes one day (or streamed slice of a day) and returns the number of bytes it sent
+DayWriter = Callable[[DaySlice], int]
+
+# called once per day when every writer has written it: (day, incoming rows, outgoing rows,
+# generation seconds, seconds per writer, bytes per writer)
+DayDone = Callable[[date, int, int, float, Dict[str, float], Dict[str, int]], None]
+
+
+class DayTally:
+    """Sums slices per day and reports each day once every writer has written its last slice."""
+
+    def __init__(self, writers: Iterable[str], on_day_done: DayDone):
+        self.writers = set(writers)
+        self.on_day_done = on_day_done
+        self._lock = threading.Lock()
+        self._days: Dict[date, dict] = {}
+
+    def _entry(self, day: date) -> dict:
+        return self._days.setdefault(
+            day, {"incoming": 0, "outgoing": 0, "gen": 0.0, "seconds": {}, "bytes": {}, "finished": set()}
+        )
+
+    def generated(self, piece: DaySlice, gen_seconds: float):
+        with self._lock:
+            entry = self._entry(piece.day)
+            entry["incoming"] += len(piece.incoming)
+            entry["outgoing"] += len(piece.outgoing)
+            entry["gen"] += gen_seconds
+
+    def written(self, name: str, piece: DaySlice, seconds: float, nbytes: int):
+        with self._lock:
+            entry = self._entry(piece.day)
+            entry["seconds"][name] = entry["seconds"].get(name, 0.0) + seconds
+            entry["bytes"][name] = entry["bytes"].get(name, 0) + nbytes
+            if piece.last:
+                entry["finished"].add(name)
+            if entry["finished"] == self.writers:
+                del self._days[piece.day]
+                self.on_day_done(
+                    piece.day, entry["incoming"], entry["outgoing"], entry["gen"], entry["seconds"], entry["bytes"]
+                )
+
+
+def run_writers(
+    writers: Dict[str, DayWriter],
+    piece: DaySlice,
+    pool: Optional[ThreadPoolExecutor] = None,
+) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """Run writers for one day or slice, concurrently when a pool is given; returns seconds and bytes per writer."""
+
+    def timed(write: DayWriter) -> Tuple[float, int]:
+        t0 = time.perf_counter()
+        nbytes = write(piece)
+        return time.perf_counter() - t0, nbytes
+
+    if pool is None:
+        results = {name: timed(write) for name, write in writers.items()}
+    else:
+        futures = {name: pool.submit(timed, write) for name, write in writers.items()}
+        results = {name: fut.result() for name, fut in futures.items()}
+    return {n: r[0] for n, r in results.items()}, {n: r[1] for n, r in results.items()}
+
+
+def run_pipeline(
+    slices: Iterable[Tuple[DaySlice, float]],
+    writers: Dict[str, DayWriter],
+    queue_depth: int,
+    on_day_done: DayDone,
+) -> Dict[str, float]:
+    """
+    Generate and write concurrently: the calling thread pulls (slice, gen_seconds) items
+    from `slices` (the producer) and hands each to one consumer thread per writer through
+    a bounded queue, so day N+1 is generated while day N is written and at most
+    `queue_depth` days (or streamed slices) wait per writer.
+    Returns busy seconds per stage ("gen" plus one entry per writer).
+    """
+    queues = {name: queue.Queue(maxsize=queue_depth) for name in writers}
+    busy = {"gen": 0.0, **{name: 0.0 for name in writers}}
+    tally = DayTally(writers, on_day_done)
+    lock = threading.Lock()
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def consume(name: str, write: DayWriter):
+        q = queues[name]
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            if stop.is_set():
+                continue  # keep draining so the producer never blocks
+            t0 = time.perf_counter()
+            try:
+                nbytes = write(item)
+            except BaseException as exc:  # surfaced in the calling thread
+                errors.append(exc)
+                stop.set()
+                continue
+            elapsed = time.perf_counter() - t0
+            with lock:
+                busy[name] += elapsed
+            tally.written(name, item, elapsed, nbytes)
+
+    def put(q: queue.Queue, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    threads = [
+        threading.Thread(target=consume, args=(name, write), name=f"write-{name}", daemon=True)
+        for name, write in writers.items()
+    ]
+    for t in threads:
+        t.start()
+    try:
+        for piece, gen_elapsed in slices:
+            with lock:
+                busy["gen"] += gen_elapsed
+            tally.generated(piece, gen_elapsed)
+            for q in queues.values():
+                put(q, piece)
+            if stop.is_set():
+                break
+    finally:
+        for q in queues.values():
+            q.put(None)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+    return busy
+
+
+# -----------------------------
+# Checkpoints: completed-day manifest and partial-day cleanup
+# -----------------------------
+class DayManifest:
+    """
+    Append-only JSON-lines record of completed (day, direction, sink) writes.
+    Each line is flushed and fsynced as soon as a sink finishes a day, so a run that
+    dies keeps everything it had finished. The first line holds the run parameters;
+    a manifest written with other parameters raises ValueError instead of resuming.
+    """
+
+    def __init__(self, path: str, params: dict):
+        self.path = path
+        self.params = json.loads(json.dumps(params))  # as it reads back (tuples become lists)
+        self._done = set()
+        recorded = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if "params" in entry:
+                            recorded = entry["params"]
+                        else:
+                            self._done.add((entry["day"], entry["direction"], entry["sink"]))
+        if recorded is None and self._done:
+            raise ValueError(f"{path} has no run parameters; remove it to start over")
+        if recorded is not None and recorded != self.params:
+            changed = sorted(k for k in recorded.keys() | self.params.keys() if recorded.get(k) != self.params.get(k))
+            raise ValueError(f"{path} was written with different parameters ({', '.join(changed)})")
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        if recorded is None:
+            self._write({"params": self.params})
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def done(self, day: date, direction: str, sink: str) -> bool:
+        return (day.isoformat(), direction, sink) in self._done
+
+    def pending(self, day: date, sink: str) -> List[str]:
+        return [d for d in DIRECTIONS if not self.done(day, d, sink)]
+
+    def record(self, day: date, direction: str, sink: str, rows: int):
+        entry = {"day": day.isoformat(), "direction": direction, "sink": sink, "rows": rows}
+        with self._lock:
+            self._write(entry)
+            self._done.add((entry["day"], direction, sink))
+
+    def close(self):
+        self._file.close()
+
+
+def checkpointed(name: str, write: DayWriter, manifest: DayManifest) -> DayWriter:
+    """
+    Wrap a writer so directions already in the manifest are skipped; a direction is
+    recorded once the day's last slice has been written. Skipped directions are passed on
+    as empty frames rather than not at all, so the writer still sees every slice (Postgres
+    writers release their shared COPY payloads per slice).
+    """
+    rows: Dict[Tuple[date, str], int] = {}  # rows written so far per (day, direction)
+
+    def run(piece: DaySlice) -> int:
+        pending = manifest.pending(piece.day, name)
+        frames = {"incoming": piece.incoming, "outgoing": piece.outgoing}
+        todo = {d: frames[d] if d in pending else slice_rows(frames[d], 0, 0) for d in DIRECTIONS}
+        nbytes = write(piece._replace(**todo))
+        for direction in pending:
+            key = (piece.day, direction)
+            rows[key] = rows.get(key, 0) + len(frames[direction])
+            if piece.last:
+                manifest.record(piece.day, direction, name, rows.pop(key))
+        return nbytes
+
+    return run
+
+
+def delete_day_pg(conn, day: date, direction: str):
+    start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    conn.execute(
+        f"DELETE FROM vehicles_{direction} WHERE ts >= %s AND ts < %s",
+        (start, start + timedelta(days=1)),
+    )
+
+
+def delete_day_s3(s3, cfg: S3Config, day: date, direction: str):
+    prefix = hive_day_dir(cfg.prefix, direction, day) + "/"
+    for page in s3.get_paginator("list_objects_v2").paginate(Bucket=cfg.bucket, Prefix=prefix):
+        keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+        if keys:
+            s3.delete_objects(Bucket=cfg.bucket, Delete={"Objects": keys})
+
+
+def delete_day_localfs(root: str, day: date, direction: str):
+    shutil.rmtree(hive_day_dir(root, direction, day), ignore_errors=True)
+
+
+# -----------------------------
+# Sinks
+# -----------------------------
+SINK_NAMES = ("pg", "s3", "localfs", "null")
+
+
+def add_sink_args(ap: argparse.ArgumentParser):
+    ap.add_argument(
+        "--sink",
+        nargs="+",
+        choices=SINK_NAMES,
+        default=["pg", "s3"],
+        help="where days are written (any combination); null discards them",
+    )
+
+    # Postgres
+    ap.add_argument("--pg-host", type=str, default="localhost")
+    ap.add_argument("--pg-port", type=int, default=55432)
+    ap.add_argument("--pg-db", type=str, default="demo")
+    ap.add_argument("--pg-user", type=str, default="demo")
+    ap.add_argument("--pg-pass", type=str, default="demo")
+    ap.add_argument(
+        "--pg-target",
+        action="append",
+        default=[],
+        help="additional Postgres DSN to mirror writes to (repeatable)",
+    )
+    ap.add_argument(
+        "--pg-copy-format",
+        choices=["text", "binary"],
+        default="text",
+        help="COPY wire format: text or binary (both encoded once per chunk and shared by all targets)",
+    )
+
+    # S3/MinIO
+    ap.add_argument("--s3-endpoint", type=str, default="http://localhost:9000")
+    ap.add_argument("--s3-access", type=str, default="minio")
+    ap.add_argument("--s3-secret", type=str, default="minio12345")
+    ap.add_argument("--s3-bucket", type=str, default="lake")
+    ap.add_argument("--s3-prefix", type=str, default="vehicles")
+    ap.add_argument(
+        "--s3-upload-workers",
+        type=int,
+        default=4,
+        help="threads encoding and uploading parquet parts concurrently",
+    )
+    ap.add_argument(
+        "--s3-multipart-mb",
+        type=int,
+        default=64,
+        help="parts larger than this are sent as multipart uploads",
+    )
+    ap.add_argument(
+        "--s3-writer",
+        choices=["buffer", "stream"],
+        default="buffer",
+        help="buffer: encode each part in memory, then upload; "
+        "stream: write row groups straight into an S3 output stream",
+    )
+
+    # local filesystem
+    ap.add_argument(
+        "--local-dir",
+        type=str,
+        default="lake/vehicles",
+        help="root directory of the localfs sink (same hive layout as S3)",
+    )
+    ap.add_argument("--local-workers", type=int, default=4, help="threads encoding parquet parts for localfs")
+
+    # Parquet layout (S3 and localfs)
+    ap.add_argument(
+        "--sort-within-part",
+        type=parse_sort_columns,
+        default=None,
+        metavar="COLUMNS",
+        help="sort each part by these columns (e.g. country,plate,ts) and declare them as parquet sorting_columns; "
+        "default keeps ingest (ts) order",
+    )
+    ap.add_argument(
+        "--row-group-rows",
+        type=int,
+        default=250_000,
+        help="rows per parquet row group (the unit readers skip by min/max statistics)",
+    )
+    ap.add_argument(
+        "--bloom-filter-fpp",
+        type=float,
+        default=None,
+        metavar="FPP",
+        help="write a bloom filter on license_plate per row group with this false-positive rate (e.g. 0.01)",
+    )
+    ap.add_argument(
+        "--target-file-mb",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="write each day as files of about this size, cut at row-group boundaries and independent of "
+        "--chunk-rows (default: one file per --chunk-rows part)",
+    )
+    ap.add_argument(
+        "--data-page-kb",
+        type=int,
+        default=None,
+        metavar="KB",
+        help="target parquet data page size (default: Arrow's 1024)",
+    )
+    ap.add_argument(
+        "--partition-country",
+        action="store_true",
+        help="add a country= level below date= (ISO-1 code; countries outside --country-partitions share _other)",
+    )
+    ap.add_argument(
+        "--country-partitions",
+        type=parse_country_partitions,
+        default=",".join(DEFAULT_COUNTRY_PARTITIONS),
+        metavar="CODES",
+        help="ISO-1 codes with their own country= directory under --partition-country (default: %(default)s)",
+    )
+
+
+def check_sink_args(ap: argparse.ArgumentParser, args):
+    args.sink = list(dict.fromkeys(args.sink))
+    if args.s3_upload_workers <= 0:
+        ap.error("--s3-upload-workers must be > 0")
+    if args.local_workers <= 0:
+        ap.error("--local-workers must be > 0")
+    if args.row_group_rows <= 0:
+        ap.error("--row-group-rows must be > 0")
+    if args.bloom_filter_fpp is not None and not 0 < args.bloom_filter_fpp < 1:
+        ap.error("--bloom-filter-fpp must be between 0 and 1")
+    if args.target_file_mb is not None and args.target_file_mb <= 0:
+        ap.error("--target-file-mb must be > 0")
+    if args.data_page_kb is not None and args.data_page_kb <= 0:
+        ap.error("--data-page-kb must be > 0")
+    if "pg" in args.sink:
+        # writers are named by host:port/dbname, so two DSNs for one database would share a name
+        seen: Dict[str, str] = {}
+        for dsn in pg_target_dsns(args):
+            try:
+                label = pg_label(dsn)
+            except psycopg.ProgrammingError as exc:
+                ap.error(f"invalid Postgres DSN {dsn!r}: {exc}")
+            if label in seen:
+                ap.error(f"--pg-target {dsn!r} names the same database as {seen[label]!r} ({label})")
+            seen[label] = dsn
+
+
+def pg_target_dsns(args) -> List[str]:
+    primary_dsn = (
+        f"postgresql://{args.pg_user}:{args.pg_pass}"
+        f"@{args.pg_host}:{args.pg_port}/{args.pg_db}"
+    )
+    pg_targets = [primary_dsn]
+    for target in args.pg_target:
+        if target not in pg_targets:
+            pg_targets.append(target)
+    return pg_targets
+
+
+def s3_config(args) -> S3Config:
+    return S3Config(
+        endpoint=args.s3_endpoint,
+        access_key=args.s3_access,
+        secret_key=args.s3_secret,
+        bucket=args.s3_bucket,
+        prefix=args.s3_prefix.rstrip("/"),
+        upload_workers=args.s3_upload_workers,
+        multipart_threshold=args.s3_multipart_mb * 1024 * 1024,
+    )
+
+
+def parquet_layout(args) -> ParquetLayout:
+    return ParquetLayout(
+        sort_by=args.sort_within_part or (),
+        row_group_rows=args.row_group_rows,
+        bloom_fpp=args.bloom_filter_fpp,
+        country_partitions=args.country_partitions if args.partition_country else (),
+        file_bytes=int(args.target_file_mb * 1024 * 1024) if args.target_file_mb else None,
+        page_bytes=args.data_page_kb * 1024 if args.data_page_kb else None,
+    )
+
+
+@dataclass
+class Sinks:
+    writers: Dict[str, DayWriter]  # Postgres targets first, named "pg:<host:port/db>"
+    pg_names: List[str]
+    cleanups: Dict[str, Callable[[date, str], None]]  # per writer: remove a partially written (day, direction)
+    destinations: Dict[str, str]  # per writer: sink and where it writes, the name its days have in a manifest
+    close: Callable[[], None]
+
+
+def open_sinks(args, chunk_rows: int, metrics: Optional[StageMetrics] = None) -> Sinks:
+    """Connect only the sinks selected with --sink and build one DayWriter per target."""
+    writers: Dict[str, DayWriter] = {}
+    pg_names: List[str] = []
+    cleanups: Dict[str, Callable[[date, str], None]] = {}
+    destinations: Dict[str, str] = {}
+    closers: List[Callable[[], None]] = []
+    layout = parquet_layout(args)
+
+    if "pg" in args.sink:
+        # one writer per Postgres target so mirrors load independently of each other
+        pg_targets: Dict[str, str] = {}
+        for dsn in pg_target_dsns(args):
+            pg_targets.setdefault(f"pg:{pg_label(dsn)}", dsn)
+        pg_names = list(pg_targets)
+        pg_conns = [psycopg.connect(pg_targets[name], autocommit=True) for name in pg_names]
+        closers.extend(conn.close for conn in pg_conns)
+        # every chunk is encoded once per day and the same buffers are sent to all targets;
+        # sized by writer name, since every named writer releases each key exactly once
+        copy_payloads = SharedCopyPayloads(len(pg_names), chunk_rows, args.pg_copy_format, metrics)
+
+        def pg_writer(conn) -> DayWriter:
+            def write(piece: DaySlice) -> int:
+                day = piece.day
+                sent = 0
+                for direction, df in (("incoming", piece.incoming), ("outgoing", piece.outgoing)):
+                    key = (day, direction, piece.part)
+                    try:
+                        if len(df):
+                            payloads = copy_payloads.acquire(key, f"vehicles_{direction}", df)
+                            t0 = time.perf_counter()
+                            rss0 = peak_rss_bytes()
+                            nbytes = write_day_pg([conn], payloads, args.pg_copy_format)
+                            if metrics is not None:
+                                elapsed = time.perf_counter() - t0
+                                metrics.add(day, "copy_transfer", elapsed, len(df), nbytes, rss_growth(rss0))
+                            sent += nbytes
+                    finally:
+                        copy_payloads.release(key)
+                return sent
+
+            return write
+
+        def pg_cleanup(conn) -> Callable[[date, str], None]:
+            return lambda day, direction: delete_day_pg(conn, day, direction)
+
+        writers.update({name: pg_writer(conn) for name, conn in zip(pg_names, pg_conns)})
+        cleanups.update({name: pg_cleanup(conn) for name, conn in zip(pg_names, pg_conns)})
+        destinations.update({name: name for name in pg_names})
+
+    if "s3" in args.sink:
+        s3cfg = s3_config(args)
+        s3 = s3_client(s3cfg)
+        s3_fs = s3_filesystem(s3cfg) if args.s3_writer == "stream" else None
+        s3_pool = ThreadPoolExecutor(max_workers=args.s3_upload_workers, thread_name_prefix="s3-upload")
+        closers.append(s3_pool.shutdown)
+        writers["s3"] = lambda piece: write_day_s3(
+            s3, s3cfg, piece.day, piece.incoming, piece.outgoing, chunk_rows,
+            pool=s3_pool, fs=s3_fs, metrics=metrics, first_part=piece.part, layout=layout,
+        )
+        cleanups["s3"] = lambda day, direction: delete_day_s3(s3, s3cfg, day, direction)
+        destinations["s3"] = f"s3://{s3cfg.bucket}/{s3cfg.prefix}"
+
+    if "localfs" in args.sink:
+        local_root = os.path.abspath(args.local_dir)
+        local_pool = ThreadPoolExecutor(max_workers=args.local_workers, thread_name_prefix="localfs")
+        closers.append(local_pool.shutdown)
+        writers["localfs"] = lambda piece: write_day_localfs(
+            local_root, piece.day, piece.incoming, piece.outgoing, chunk_rows,
+            pool=local_pool, metrics=metrics, first_part=piece.part, layout=layout,
+        )
+        cleanups["localfs"] = lambda day, direction: delete_day_localfs(local_root, day, direction)
+        destinations["localfs"] = f"localfs:{local_root}"
+
+    if "null" in args.sink:
+        writers["null"] = write_day_null
+        cleanups["null"] = lambda day, direction: None
+        destinations["null"] = "null"
+
+    def close():
+        for closer in closers:
+            closer()
+
+    return Sinks(writers=writers, pg_names=pg_names, cleanups=cleanups, destinations=destinations, close=close)
+
+
+def resume_from_manifest(
+    manifest: DayManifest,
+    sinks: Sinks,
+    days: Sequence[date],
+) -> Tuple[Dict[str, DayWriter], List[date]]:
+    """
+    Prepare a resumed run: wrap every writer with the manifest and clean up partial output.
+    Each writer handles days in order, so only its first unfinished day can be partially
+    written; that day's pending directions are removed before it is written again.
+    Days are recorded per destination, so a writer pointed somewhere else starts over.
+    Returns the wrapped writers and the days that still have pending work.
+    """
+    dest = sinks.destinations
+    for name in sinks.writers:
+        for day in days:
+            pending = manifest.pending(day, dest[name])
+            if pending:
+                for direction in pending:
+                    sinks.cleanups[name](day, direction)
+                break
+    writers = {name: checkpointed(dest[name], write, manifest) for name, write in sinks.writers.items()}
+    todo = [day for day in days if any(manifest.pending(day, dest[name]) for name in sinks.writers)]
+    return writers, todo
+
+
+# -----------------------------
+# Sharding: day assignment across hosts and shard manifests
+# -----------------------------
+SHARD_DIR = "_shards"  # underscore prefix: ignored by hive-style readers
+
+# arguments that change how a day is laid out in Parquet
+LAYOUT_PARAMS = (
+    "sort_within_part",
+    "row_group_rows",
+    "bloom_filter_fpp",
+    "partition_country",
+    "country_partitions",
+    "target_file_mb",
+    "data_page_kb",
+)
+
+# arguments that change what a day contains or how it is laid out; all shards of one dataset must agree on them
+SHARD_PARAMS = (
+    "seed",
+    "avg_in_per_day",
+    "avg_out_per_day",
+    "day_jitter",
+    "missing_prob",
+    "commuters",
+    "chilled",
+    "smugglers",
+    "misplace_per_day",
+    "misplace_max_offset",
+    "legacy_gen",
+    "stream_day",
+    "chunk_rows",
+) + LAYOUT_PARAMS
+
+
+def shard_params(args, start_day: date, days: int) -> dict:
+    """The run parameters as they read back from JSON (tuples become lists), so manifests compare equal."""
+    params = {"start_date": start_day.isoformat(), "days": days}
+    params.update({name: getattr(args, name) for name in SHARD_PARAMS})
+    return json.loads(json.dumps(params))
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """argparse type for --shard INDEX/COUNT."""
+    try:
+        index, count = (int(v) for v in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, got {text!r}")
+    if count <= 0 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"need 0 <= INDEX < COUNT, got {text!r}")
+    return index, count
+
+
+def shard_days(day_starts: Sequence[datetime], index: int, count: int) -> List[datetime]:
+    """
+    The days owned by shard index of count: every count-th day of the full range, so
+    shards stay balanced over weekdays and seasons. Every day has its own random stream
+    (day_seed), so the union of all shards equals a single-host run.
+    """
+    return [d for k, d in enumerate(day_starts) if k % count == index]
+
+
+def shard_manifest_name(index: int, count: int) -> str:
+    return f"shard-{index:05d}-of-{count:05d}.json"
+
+
+def shard_stores(args) -> List[Tuple[str, pafs.FileSystem, str]]:
+    """
+    (label, filesystem, root) of every place shard manifests live: the root of each file
+    sink (localfs, s3), or --local-dir when only pg/null sinks are selected.
+    """
+    stores = []
+    if "s3" in args.sink:
+        cfg = s3_config(args)
+        stores.append((f"s3://{cfg.bucket}/{cfg.prefix}", s3_filesystem(cfg), f"{cfg.bucket}/{cfg.prefix}"))
+    if "localfs" in args.sink or not stores:
+        root = os.path.abspath(args.local_dir)
+        stores.append((root, pafs.LocalFileSystem(), root))
+    return stores
+
+
+def read_json(fs: pafs.FileSystem, path: str) -> Optional[dict]:
+    if fs.get_file_info(path).type != pafs.FileType.File:
+        return None
+    with fs.open_input_stream(path) as f:
+        return json.loads(f.read())
+
+
+def write_json(fs: pafs.FileSystem, path: str, doc: dict):
+    """Write a small JSON document so readers never see it half-written (temp file, then move)."""
+    if isinstance(fs, pafs.LocalFileSystem):
+        fs.create_dir(os.path.dirname(path), recursive=True)
+    tmp = f"{path}.tmp"
+    with fs.open_output_stream(tmp) as f:
+        f.write(json.dumps(doc, indent=1).encode("utf-8"))
+    fs.move(tmp, path)
+
+
+class ShardManifest:
+    """
+    Completeness record of one shard: the run parameters, the days the shard owns, the
+    rows written per day and a status ("running" until the last day, then "complete").
+    Rewritten after every day under <root>/_shards/ of each store, so a coordinator can
+    follow progress and check the union with verify_shards. Rows recorded by an earlier,
+    interrupted run of the same shard are kept.
+    """
+
+    def __init__(self, stores, index: int, count: int, params: dict, owned: Sequence[date], sinks: Sequence[str]):
+        self.stores = stores
+        self.name = shard_manifest_name(index, count)
+        rows = {}
+        for _, fs, root in stores:
+            old = read_json(fs, f"{root}/{SHARD_DIR}/{self.name}")
+            if old is not None and old.get("params") == params:
+                rows = old.get("rows", {})
+                break
+        self.doc = {
+            "shard": index,
+            "count": count,
+            "params": params,
+            "sinks": sorted(sinks),
+            "days": [d.isoformat() for d in owned],
+            "rows": rows,
+            "status": "running",
+            "updated": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self._save()
+
+    def _save(self):
+        self.doc["updated"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        for _, fs, root in self.stores:
+            write_json(fs, f"{root}/{SHARD_DIR}/{self.name}", self.doc)
+
+    def day_done(self, day: date, n_in: int, n_out: int):
+        self.doc["rows"][day.isoformat()] = {"incoming": n_in, "outgoing": n_out}
+        self._save()
+
+    def finish(self):
+        self.doc["status"] = "complete"
+        self._save()
+
+
+def verify_shards(fs: pafs.FileSystem, root: str) -> Tuple[bool, List[str]]:
+    """
+    Check the shard manifests under root: all shards of one run present and complete,
+    their days disjoint and together covering the full day range, with rows recorded
+    for every day. Returns (ok, report lines).
+    """
+    selector = pafs.FileSelector(f"{root}/{SHARD_DIR}", allow_not_found=True)
+    docs = [
+        read_json(fs, info.path)
+        for info in fs.get_file_info(selector)
+        if info.base_name.startswith("shard-") and info.base_name.endswith(".json")
+    ]
+    if not docs:
+        return False, ["no shard manifests found"]
+    lines = []
+    params, count = docs[0]["params"], docs[0]["count"]
+    if any(d["params"] != params or d["count"] != count for d in docs):
+        return False, ["shard manifests come from different runs (params or shard count differ)"]
+
+    owner: Dict[str, int] = {}
+    ok = True
+    by_index = {d["shard"]: d for d in docs}
+    for index in range(count):
+        doc = by_index.get(index)
+        if doc is None:
+            lines.append(f"shard {index}/{count}: missing")
+            ok = False
+            continue
+        unrecorded = [day for day in doc["days"] if day not in doc["rows"]]
+        rows = sum(r["incoming"] + r["outgoing"] for r in doc["rows"].values())
+        line = f"shard {index}/{count}: {doc['status']}, {len(doc['days'])} day(s), {rows:,} rows"
+        if unrecorded:
+            line += f", {len(unrecorded)} day(s) without rows (first {unrecorded[0]})"
+        lines.append(line)
+        ok = ok and doc["status"] == "complete" and not unrecorded
+        for day in doc["days"]:
+            if day in owner:
+                lines.append(f"day {day} owned by shards {owner[day]} and {index}")
+                ok = False
+            owner[day] = index
+
+    start = date.fromisoformat(params["start_date"])
+    expected = {(start + timedelta(days=k)).isoformat() for k in range(params["days"])}
+    if set(owner) != expected:
+        lines.append(f"{len(expected - set(owner))} day(s) of the range owned by no shard")
+        ok = False
+    return ok, lines
 
 
 def main():
@@ -509,7 +2731,39 @@ def main():
     ap.add_argument("--day-jitter", type=float, default=0.12, help="± jitter factor around avg (0.12 = ±12%)")
 
     ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="generate days in N processes (output is identical for any N)",
+    )
+    ap.add_argument(
+        "--legacy-gen",
+        action="store_true",
+        help="use the original per-row baseline generator (slow, for comparison)",
+    )
+    ap.add_argument(
+        "--arrow",
+        action="store_true",
+        help="generate each day as pyarrow Tables and feed both sinks without pandas",
+    )
+    ap.add_argument(
+        "--stream-day",
+        action="store_true",
+        help="generate each day as time-ordered slices of --chunk-rows rows with bounded memory (implies --arrow)",
+    )
     ap.add_argument("--chunk-rows", type=int, default=250_000)
+    ap.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="generate the next day while the previous one is written (Postgres and S3 in parallel)",
+    )
+    ap.add_argument(
+        "--queue-depth",
+        type=int,
+        default=2,
+        help="max days (or streamed slices) buffered per writer in --pipeline mode (caps memory)",
+    )
 
     # Allow "few missing"
     ap.add_argument("--missing-prob", type=float, default=0.015, help="probability an injected event is missing")
@@ -523,31 +2777,57 @@ def main():
     ap.add_argument("--anomaly-per-day", type=int, default=None, help=argparse.SUPPRESS)
     ap.add_argument("--anomaly-max-day-shift", type=int, default=None, help=argparse.SUPPRESS)
 
-    # Postgres
-    ap.add_argument("--pg-host", type=str, default="localhost")
-    ap.add_argument("--pg-port", type=int, default=55432)
-    ap.add_argument("--pg-db", type=str, default="demo")
-    ap.add_argument("--pg-user", type=str, default="demo")
-    ap.add_argument("--pg-pass", type=str, default="demo")
+    add_sink_args(ap)
     ap.add_argument(
-        "--pg-target",
-        action="append",
-        default=[],
-        help="additional Postgres DSN to mirror writes to (repeatable)",
+        "--manifest",
+        type=str,
+        default=None,
+        help="JSON-lines checkpoint of completed (day, direction, sink); rerun with the same file to resume",
+    )
+    ap.add_argument(
+        "--metrics",
+        type=str,
+        default=None,
+        help="append per-day and summary stage metrics (seconds, rows/s, bytes/s, peak RSS) as JSON lines",
     )
 
-    # S3/MinIO
-    ap.add_argument("--s3-endpoint", type=str, default="http://localhost:9000")
-    ap.add_argument("--s3-access", type=str, default="minio")
-    ap.add_argument("--s3-secret", type=str, default="minio12345")
-    ap.add_argument("--s3-bucket", type=str, default="lake")
-    ap.add_argument("--s3-prefix", type=str, default="vehicles")
+    ap.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="INDEX/COUNT",
+        help="generate only every COUNT-th day starting at INDEX (0-based) and keep a shard manifest in _shards/",
+    )
+    ap.add_argument(
+        "--verify-shards",
+        action="store_true",
+        help="check the shard manifests under the file sink roots (or --local-dir) and exit (status 1 if incomplete)",
+    )
 
     args = ap.parse_args()
+    if args.arrow and args.legacy_gen:
+        ap.error("--arrow and --legacy-gen are mutually exclusive")
+    if args.stream_day and (args.legacy_gen or args.workers > 1):
+        ap.error("--stream-day generates in-process with the vectorized generator; drop --legacy-gen/--workers")
     if args.anomaly_per_day is not None:
         args.misplace_per_day = args.anomaly_per_day
     if args.anomaly_max_day_shift is not None:
         args.misplace_max_offset = args.anomaly_max_day_shift
+    if args.workers <= 0:
+        ap.error("--workers must be > 0")
+    if args.queue_depth <= 0:
+        ap.error("--queue-depth must be > 0")
+    check_sink_args(ap, args)
+    if args.verify_shards:
+        all_ok = True
+        for label, fs, root in shard_stores(args):
+            ok, lines = verify_shards(fs, root)
+            print(f"{label}: {'complete' if ok else 'INCOMPLETE'}", flush=True)
+            for line in lines:
+                print(f"  {line}", flush=True)
+            all_ok = all_ok and ok
+        raise SystemExit(0 if all_ok else 1)
+    # setup stream: country weights + standout pools; each day gets its own stream (day_rng)
     rng = np.random.default_rng(args.seed)
 
     start_day = datetime.fromisoformat(args.start_date).replace(tzinfo=timezone.utc)
@@ -568,91 +2848,174 @@ def main():
         n_smugglers=args.smugglers,
     )
 
-    primary_dsn = (
-        f"postgresql://{args.pg_user}:{args.pg_pass}"
-        f"@{args.pg_host}:{args.pg_port}/{args.pg_db}"
-    )
-    pg_targets = [primary_dsn]
-    for target in args.pg_target:
-        if target not in pg_targets:
-            pg_targets.append(target)
-
-    pg_conns = [psycopg.connect(dsn, autocommit=True) for dsn in pg_targets]
-
-    s3cfg = S3Config(
-        endpoint=args.s3_endpoint,
-        access_key=args.s3_access,
-        secret_key=args.s3_secret,
-        bucket=args.s3_bucket,
-        prefix=args.s3_prefix.rstrip("/"),
+    metrics = StageMetrics()
+    metrics_log = open(args.metrics, "a", encoding="utf-8") if args.metrics else None
+    sinks = open_sinks(args, args.chunk_rows, metrics)
+    writers = sinks.writers
+    pg_names = sinks.pg_names
+    manifest = None
+
+    gen_cfg = DayGenConfig(
+        countries=countries,
+        weights=weights,
+        commuters=commuters,
+        chilled=chilled,
+        smugglers=smugglers,
+        avg_in_per_day=args.avg_in_per_day,
+        avg_out_per_day=args.avg_out_per_day,
+        day_jitter=args.day_jitter,
+        missing_prob=args.missing_prob,
+        misplace_per_day=args.misplace_per_day,
+        misplace_max_offset=args.misplace_max_offset,
+        legacy=args.legacy_gen,
+        as_arrow=args.arrow or args.stream_day,
     )
-    s3 = s3_client(s3cfg)
-
-    pg_total = 0.0
-    s3_total = 0.0
+    day_starts = [start_day + timedelta(days=d) for d in range(days)]
+    shard = None
+    if args.shard is not None:
+        index, count = args.shard
+        day_starts = shard_days(day_starts, index, count)
+        params = shard_params(args, start_day.date(), days)
+        shard = ShardManifest(shard_stores(args), index, count, params, [d.date() for d in day_starts], args.sink)
+        print(f"Shard {index}/{count}: {len(day_starts)} of {days} day(s)", flush=True)
+    if args.manifest:
+        try:
+            manifest = DayManifest(args.manifest, shard_params(args, start_day.date(), days))
+        except ValueError as exc:
+            sinks.close()
+            ap.error(str(exc))
+        writers, todo = resume_from_manifest(manifest, sinks, [d.date() for d in day_starts])
+        if len(todo) < len(day_starts):
+            print(f"Resuming from {args.manifest}: {len(day_starts) - len(todo)} day(s) already complete", flush=True)
+        todo_days = set(todo)
+        day_starts = [d for d in day_starts if d.date() in todo_days]
+
+    bytes_total = {name: 0 for name in writers}
+
+    def report_day(
+        day: date,
+        n_in: int,
+        n_out: int,
+        gen_elapsed: float,
+        timings: Dict[str, float],
+        volumes: Dict[str, int],
+    ):
+        for name, nbytes in volumes.items():
+            bytes_total[name] += nbytes
+        line = f"{day} incoming={n_in:,} outgoing={n_out:,} gen={gen_elapsed:.2f}s"
+        if pg_names:
+            pg_slowest = max(timings[name] for name in pg_names)
+            line += f" pg={pg_slowest:.2f}s"
+            if len(pg_names) > 1:
+                line += " [" + " ".join(f"{name[3:]}={timings[name]:.2f}s" for name in pg_names) + "]"
+        for name in ("s3", "localfs"):
+            if name in timings:
+                line += f" {name}={timings[name]:.2f}s ({mb_per_s(volumes[name], timings[name]):.1f} MB/s)"
+        print(line, flush=True)
+        if shard is not None:
+            shard.day_done(day, n_in, n_out)
+        stages = metrics.pop_day(day)
+        if metrics_log is not None:
+            record = {
+                "type": "day",
+                "day": day.isoformat(),
+                "incoming": n_in,
+                "outgoing": n_out,
+                "gen_seconds": round(gen_elapsed, 4),
+                "writers": {n: {"seconds": round(timings[n], 4), "bytes": volumes[n]} for n in timings},
+                "stages": stages,
+                "peak_rss_mb": round(peak_rss_bytes() / 1e6, 1),
+            }
+            metrics_log.write(json.dumps(record) + "\n")
+            metrics_log.flush()
+
+    pg_writers = {name: writers[name] for name in pg_names}
+    other_writers = {name: write for name, write in writers.items() if name not in pg_writers}
+    pg_pool = ThreadPoolExecutor(max_workers=max(len(pg_writers), 1), thread_name_prefix="pg-copy")
+    if args.stream_day:
+        slices = stream_days(gen_cfg, args.seed, day_starts, args.chunk_rows, metrics)
+    else:
+        slices = (
+            (DaySlice(day_start.date(), incoming, outgoing), gen_elapsed)
+            for day_start, incoming, outgoing, gen_elapsed in generate_days(
+                gen_cfg, args.seed, day_starts, workers=args.workers, metrics=metrics
+            )
+        )
     run_start = time.perf_counter()
 
-    for d in range(days):
-        day_start = start_day + timedelta(days=d)
-        day = day_start.date()
+    if args.pipeline:
+        busy = run_pipeline(slices, writers, args.queue_depth, report_day)
+    else:
+        busy = {"gen": 0.0, **{name: 0.0 for name in writers}}
+        tally = DayTally(writers, report_day)
+        for piece, gen_elapsed in slices:
+            busy["gen"] += gen_elapsed
+            tally.generated(piece, gen_elapsed)
+            timings, volumes = run_writers(pg_writers, piece, pool=pg_pool)
+            other_timings, other_volumes = run_writers(other_writers, piece)
+            timings.update(other_timings)
+            volumes.update(other_volumes)
+            for name, elapsed in timings.items():
+                busy[name] += elapsed
+                tally.written(name, piece, elapsed, volumes[name])
+    wall = time.perf_counter() - run_start
+
+    sinks.close()
+    pg_pool.shutdown()
+    if manifest is not None:
+        manifest.close()
+    if shard is not None:
+        shard.finish()
 
-        j = args.day_jitter
-        in_target = int(args.avg_in_per_day * (1 + rng.uniform(-j, j)))
-        out_target = int(args.avg_out_per_day * (1 + rng.uniform(-j, j)))
-
-        incoming, outgoing = generate_day_events(
-            rng=rng,
-            day_start=day_start,
-            incoming_target=in_target,
-            outgoing_target=out_target,
-            countries=countries,
-            weights=weights,
-            commuters=commuters,
-            chilled=chilled,
-            smugglers=smugglers,
-            missing_prob=args.missing_prob,
-            misplace_per_day=args.misplace_per_day,
-            misplace_max_offset=args.misplace_max_offset,
+    print("\n--- ingest timings (informational only) ---", flush=True)
+    print(f"Total wall time: {wall:.2f}s", flush=True)
+    print(f"Generation total ({args.workers} worker(s)): {busy['gen']:.2f}s", flush=True)
+    if pg_names:
+        print(
+            f"Postgres insert total: {max(busy[name] for name in pg_names):.2f}s (slowest target)",
+            flush=True,
         )
-        incoming = apply_iso1_codes(incoming)
-        outgoing = apply_iso1_codes(outgoing)
-
-        t_pg = time.perf_counter()
-        for off in range(0, len(incoming), args.chunk_rows):
-            chunk = incoming.iloc[off:off + args.chunk_rows]
-            for conn in pg_conns:
-                insert_postgres_copy(conn, "vehicles_incoming", chunk)
-        for off in range(0, len(outgoing), args.chunk_rows):
-            chunk = outgoing.iloc[off:off + args.chunk_rows]
-            for conn in pg_conns:
-                insert_postgres_copy(conn, "vehicles_outgoing", chunk)
-        pg_elapsed = time.perf_counter() - t_pg
-        pg_total += pg_elapsed
-
-        t_s3 = time.perf_counter()
-        part = 0
-        for off in range(0, max(len(incoming), len(outgoing)), args.chunk_rows):
-            if off < len(incoming):
-                write_parquet_to_s3(s3, s3cfg, incoming.iloc[off:off + args.chunk_rows], "incoming", day, part)
-            if off < len(outgoing):
-                write_parquet_to_s3(s3, s3cfg, outgoing.iloc[off:off + args.chunk_rows], "outgoing", day, part)
-            part += 1
-        s3_elapsed = time.perf_counter() - t_s3
-        s3_total += s3_elapsed
-
+        if len(pg_names) > 1:
+            for name in pg_names:
+                print(f"  {name[3:]}: {busy[name]:.2f}s", flush=True)
+    if "s3" in writers:
         print(
-            f"{day} incoming={len(incoming):,} outgoing={len(outgoing):,} "
-            f"pg={pg_elapsed:.2f}s s3={s3_elapsed:.2f}s",
+            f"S3 parquet write total: {busy['s3']:.2f}s "
+            f"({bytes_total['s3'] / 1e6:,.1f} MB, {mb_per_s(bytes_total['s3'], busy['s3']):.1f} MB/s "
+            f"with {args.s3_upload_workers} upload thread(s))",
             flush=True,
         )
-
-    for conn in pg_conns:
-        conn.close()
-
-    print("\n--- ingest timings (informational only) ---", flush=True)
-    print(f"Total wall time: {time.perf_counter() - run_start:.2f}s", flush=True)
-    print(f"Postgres insert total: {pg_total:.2f}s", flush=True)
-    print(f"S3 parquet write total: {s3_total:.2f}s", flush=True)
+    if "localfs" in writers:
+        print(
+            f"Local parquet write total: {busy['localfs']:.2f}s "
+            f"({bytes_total['localfs'] / 1e6:,.1f} MB, {mb_per_s(bytes_total['localfs'], busy['localfs']):.1f} MB/s "
+            f"with {args.local_workers} thread(s)) -> {args.local_dir}",
+            flush=True,
+        )
+    if args.pipeline:
+        busy_sum = sum(busy.values())
+        print(
+            f"Pipeline overlap: {max(busy_sum - wall, 0.0):.2f}s of {busy_sum:.2f}s stage time hidden "
+            f"({busy_sum / wall if wall > 0 else 0.0:.2f}x stage time per wall second)",
+            flush=True,
+        )
+    stage_totals = metrics.summary()
+    print_stage_summary(stage_totals)
+    if metrics_log is not None:
+        summary = {
+            "type": "summary",
+            "days": len(day_starts),
+            "workers": args.workers,
+            "pipeline": args.pipeline,
+            "sinks": args.sink,
+            "wall_seconds": round(wall, 4),
+            "busy_seconds": {name: round(secs, 4) for name, secs in busy.items()},
+            "bytes": bytes_total,
+            "stages": stage_totals,
+            "peak_rss_mb": round(peak_rss_bytes() / 1e6, 1),
+        }
+        metrics_log.write(json.dumps(summary) + "\n")
+        metrics_log.close()
 
 
 if __name__ == "__main__":
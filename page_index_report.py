@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.fs as pafs
+
+from generate_vehicles import S3Config, s3_filesystem
+from replay_vehicles import list_day_files
+
+
+# -----------------------------
+# Parquet footer and page index (Thrift compact protocol)
+# -----------------------------
+class CompactReader:
+    """Minimal Thrift compact-protocol decoder: a struct becomes {field id: value}."""
+
+    def __init__(self, buf: bytes, pos: int = 0):
+        self.buf = buf
+        self.pos = pos
+
+    def byte(self) -> int:
+        self.pos += 1
+        return self.buf[self.pos - 1]
+
+    def varint(self) -> int:
+        shift = result = 0
+        while True:
+            b = self.byte()
+            result |= (b & 0x7F) << shift
+            if not b & 0x80:
+                return result
+            shift += 7
+
+    def zigzag(self) -> int:
+        n = self.varint()
+        return (n >> 1) ^ -(n & 1)
+
+    def value(self, ftype: int):
+        if ftype in (1, 2):  # bool struct field: the value is the type
+            return ftype == 1
+        if ftype == 3:
+            return struct.unpack("b", bytes([self.byte()]))[0]
+        if ftype in (4, 5, 6):
+            return self.zigzag()
+        if ftype == 7:
+            self.pos += 8
+            return struct.unpack_from("<d", self.buf, self.pos - 8)[0]
+        if ftype == 8:
+            size = self.varint()
+            self.pos += size
+            return self.buf[self.pos - size:self.pos]
+        if ftype in (9, 10):
+            return self.list()
+        if ftype == 11:
+            size = self.varint()
+            kv = self.byte() if size else 0
+            return {self.value(kv >> 4): self.value(kv & 0x0F) for _ in range(size)}
+        if ftype == 12:
+            return self.struct()
+        raise ValueError(f"unknown thrift compact type {ftype}")
+
+    def list(self) -> list:
+        header = self.byte()
+        size, etype = header >> 4, header & 0x0F
+        if size == 15:
+            size = self.varint()
+        if etype in (1, 2):  # bool elements are one byte each
+            return [self.byte() == 1 for _ in range(size)]
+        return [self.value(etype) for _ in range(size)]
+
+    def struct(self) -> Dict[int, object]:
+        fields: Dict[int, object] = {}
+        last = 0
+        while True:
+            header = self.byte()
+            if header == 0:
+                return fields
+            delta, ftype = header >> 4, header & 0x0F
+            last = last + delta if delta else self.zigzag()
+            fields[last] = self.value(ftype)
+
+
+@dataclass
+class ChunkPages:
+    """One column chunk: its chunk statistics and, with a page index, per-page stats and sizes."""
+
+    min_value: Optional[bytes]
+    max_value: Optional[bytes]
+    compressed_bytes: int
+    dictionary_bytes: int  # read along with any page of the chunk
+    page_bytes: Optional[List[int]]  # None without a page index
+    page_min: Optional[List[bytes]]
+    page_max: Optional[List[bytes]]
+    page_null: Optional[List[bool]]
+
+
+def chunk_stats(meta: Dict[int, object]) -> Tuple[Optional[bytes], Optional[bytes]]:
+    stats = meta.get(12, {})
+    return stats.get(6, stats.get(2)), stats.get(5, stats.get(1))  # min_value/max_value, else legacy min/max
+
+
+def read_column_pages(f: pa.NativeFile, column: str) -> List[ChunkPages]:
+    """Chunk and page statistics of one column in every row group of an open Parquet file."""
+    size = f.size()
+    tail = f.read_at(8, size - 8)
+    if tail[4:] != b"PAR1":
+        raise ValueError("not a parquet file")
+    footer_len = struct.unpack("<i", tail[:4])[0]
+    footer = CompactReader(f.read_at(footer_len, size - 8 - footer_len)).struct()
+
+    chunks = []
+    for row_group in footer.get(4, []):
+        for chunk in row_group[1]:
+            meta = chunk.get(3, {})
+            if b".".join(meta.get(3, [])).decode() == column:
+                chunks.append(chunk)
+                break
+    # the column and offset indexes sit together between the last row group and the footer
+    indexed = [c for c in chunks if 4 in c and 6 in c]
+    if indexed:
+        start = min(min(c[4], c[6]) for c in indexed)
+        end = max(max(c[4] + c[5], c[6] + c[7]) for c in indexed)
+        index = f.read_at(end - start, start)
+
+    pages = []
+    for chunk in chunks:
+        meta = chunk.get(3, {})
+        lo, hi = chunk_stats(meta)
+        info = ChunkPages(lo, hi, meta.get(7, 0), 0, None, None, None, None)
+        if 4 in chunk and 6 in chunk:
+            offsets = CompactReader(index, chunk[4] - start).struct()
+            column_index = CompactReader(index, chunk[6] - start).struct()
+            if 11 in meta:
+                info.dictionary_bytes = offsets[1][0][1] - meta[11]
+            info.page_bytes = [loc[2] for loc in offsets[1]]
+            info.page_null = column_index[1]
+            info.page_min, info.page_max = column_index[2], column_index[3]
+        pages.append(info)
+    return pages
+
+
+# -----------------------------
+# Pruning report
+# -----------------------------
+Overlaps = Callable[[bytes, bytes], bool]
+
+
+@dataclass
+class Tally:
+    row_groups: int = 0
+    pages: int = 0
+    nbytes: int = 0
+
+    def add(self, pages: int, nbytes: int):
+        self.row_groups += 1
+        self.pages += pages
+        self.nbytes += nbytes
+
+
+def tally_pages(chunks: List[ChunkPages], overlaps: Overlaps, totals: Dict[str, Tally]) -> int:
+    """
+    Count row groups, pages and bytes of one file into totals: all of them, those a reader decodes
+    after row-group pruning, and those it reads with the page index. Returns chunks without an index.
+    """
+    unindexed = 0
+    for c in chunks:
+        n_pages = len(c.page_bytes) if c.page_bytes is not None else 1
+        totals["all"].add(n_pages, c.compressed_bytes)
+        if c.min_value is not None and c.max_value is not None and not overlaps(c.min_value, c.max_value):
+            continue
+        totals["row-group stats"].add(n_pages, c.compressed_bytes)
+        if c.page_bytes is None:
+            unindexed += 1
+            totals["page index"].add(n_pages, c.compressed_bytes)
+            continue
+        kept = [
+            size
+            for size, null, lo, hi in zip(c.page_bytes, c.page_null, c.page_min, c.page_max)
+            if not null and overlaps(lo, hi)
+        ]
+        if kept:
+            totals["page index"].add(len(kept), c.dictionary_bytes + sum(kept))
+    return unindexed
+
+
+def ts_window(start: datetime, end: datetime) -> Overlaps:
+    """Pages of ts (int64 microseconds) that may hold rows in [start, end)."""
+    lo_us, hi_us = (int(t.timestamp() * 1_000_000) for t in (start, end))
+    return lambda lo, hi: struct.unpack("<q", lo)[0] < hi_us and struct.unpack("<q", hi)[0] >= lo_us
+
+
+def plate_equals(plate: str) -> Overlaps:
+    value = plate.encode()
+    return lambda lo, hi: lo <= value <= hi
+
+
+def parse_utc(text: str) -> datetime:
+    t = datetime.fromisoformat(text)
+    return t.replace(tzinfo=timezone.utc) if t.tzinfo is None else t
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Pages and bytes a reader needs for a ts window or plate lookup, "
+        "with row-group statistics only and with the Parquet page index"
+    )
+    ap.add_argument(
+        "--source",
+        type=str,
+        default="s3://lake/vehicles",
+        help="dataset root (contains direction=*/date=*): a local directory or s3://bucket/prefix",
+    )
+    ap.add_argument("--direction", choices=["incoming", "outgoing"], default=None, help="default: both")
+    ap.add_argument("--start", type=parse_utc, default=None, help="ts window start, e.g. 2025-01-03T00:00 (UTC)")
+    ap.add_argument("--end", type=parse_utc, default=None, help="ts window end (exclusive)")
+    ap.add_argument("--plate", type=str, default=None, help="license_plate to look up instead of a ts window")
+    ap.add_argument("--s3-endpoint", type=str, default="http://localhost:9000")
+    ap.add_argument("--s3-access", type=str, default="minio")
+    ap.add_argument("--s3-secret", type=str, default="minio12345")
+
+    args = ap.parse_args()
+    if args.plate is not None:
+        column, overlaps, label = "license_plate", plate_equals(args.plate), f"license_plate = {args.plate}"
+    elif args.start is not None and args.end is not None:
+        column, overlaps = "ts", ts_window(args.start, args.end)
+        label = f"ts in [{args.start.isoformat()}, {args.end.isoformat()})"
+    else:
+        ap.error("give --start and --end, or --plate")
+
+    if args.source.startswith("s3://"):
+        bucket, _, prefix = args.source[len("s3://"):].partition("/")
+        fs = s3_filesystem(S3Config(args.s3_endpoint, args.s3_access, args.s3_secret, bucket, prefix))
+        root = f"{bucket}/{prefix.strip('/')}".rstrip("/")
+    else:
+        fs, root = pafs.LocalFileSystem(), os.path.abspath(args.source)
+
+    paths = [
+        path
+        for files in list_day_files(fs, root).values()
+        for direction, day_paths in files.items()
+        if args.direction in (None, direction)
+        for path in day_paths
+    ]
+    if not paths:
+        raise SystemExit(f"no direction=*/date=* parquet parts under {args.source}")
+
+    totals = {name: Tally() for name in ("all", "row-group stats", "page index")}
+    unindexed = 0
+    for path in paths:
+        with fs.open_input_file(path) as f:
+            unindexed += tally_pages(read_column_pages(f, column), overlaps, totals)
+
+    print(f"{label}: {len(paths):,} file(s)", flush=True)
+    for name, t in totals.items():
+        print(
+            f"  {name:<16} {t.row_groups:>8,} row groups {t.pages:>10,} pages {t.nbytes / 1e6:>12,.2f} MB",
+            flush=True,
+        )
+    if unindexed:
+        print(f"  {unindexed:,} matching column chunk(s) have no page index and are counted whole", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import groupby
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+from generate_vehicles import (
+    ARROW_SCHEMA,
+    DIRECTIONS,
+    LAYOUT_PARAMS,
+    DayManifest,
+    DaySlice,
+    StageMetrics,
+    add_sink_args,
+    check_sink_args,
+    frame_nbytes,
+    mb_per_s,
+    open_sinks,
+    peak_rss_bytes,
+    print_stage_summary,
+    resume_from_manifest,
+    rss_growth,
+    run_pipeline,
+    s3_config,
+    s3_filesystem,
+    ts_us,
+)
+
+
+# -----------------------------
+# Source dataset: direction=*/date=*[/country=*]/part-*.parquet, local or S3
+# -----------------------------
+DIRECTION_RE = re.compile(r"(?:^|/)direction=([^/]+)/")
+DATE_RE = re.compile(r"(?:^|/)date=(\d{4}-\d{2}-\d{2})/")
+PART_RE = re.compile(r"^part-(\d+)")
+
+
+def open_source(args) -> Tuple[pafs.FileSystem, str]:
+    """Filesystem and root of --source; s3:// sources use the --s3-* endpoint and credentials."""
+    if args.source.startswith("s3://"):
+        bucket, _, prefix = args.source[len("s3://"):].partition("/")
+        return s3_filesystem(s3_config(args)), f"{bucket}/{prefix.strip('/')}".rstrip("/")
+    return pafs.LocalFileSystem(), os.path.abspath(args.source)
+
+
+def list_day_files(fs: pafs.FileSystem, root: str) -> Dict[date, Dict[str, List[str]]]:
+    """Parquet parts under root by day and direction, in part order; other files are ignored."""
+    days: Dict[date, Dict[str, List[str]]] = {}
+    for info in fs.get_file_info(pafs.FileSelector(root, recursive=True)):
+        if info.type != pafs.FileType.File or not info.base_name.endswith(".parquet"):
+            continue
+        rel = info.path[len(root):]
+        direction, day = DIRECTION_RE.search(rel), DATE_RE.search(rel)
+        if direction is None or day is None or direction.group(1) not in DIRECTIONS:
+            continue
+        files = days.setdefault(date.fromisoformat(day.group(1)), {d: [] for d in DIRECTIONS})
+        files[direction.group(1)].append(info.path)
+    for files in days.values():
+        for paths in files.values():
+            # part number first, so the files of one part (country buckets, -KKK splits) are adjacent
+            paths.sort(key=lambda p: (p.rsplit("/", 1)[-1], p))
+    return dict(sorted(days.items()))
+
+
+def part_number(path: str) -> str:
+    match = PART_RE.match(path.rsplit("/", 1)[-1])
+    return match.group(1) if match else ""
+
+
+def read_part(fs: pafs.FileSystem, paths: List[str]) -> pa.Table:
+    """
+    Read the files of one part with the generator's schema. A part split into country= buckets or
+    written with --sort-within-part is no longer in ingest order; it is put back in ts order
+    (stable, so rows with equal ts keep their file order). Misplaced rows cannot be told apart
+    from the rest there and end up at their ts.
+    """
+    batches = []
+    reordered = len({path.rsplit("/", 1)[0] for path in paths}) > 1
+    for path in paths:
+        with fs.open_input_file(path) as f:
+            pf = pq.ParquetFile(f)
+            reordered |= any(pf.metadata.row_group(i).sorting_columns for i in range(pf.num_row_groups))
+            batches.extend(pf.iter_batches(columns=ARROW_SCHEMA.names))
+    if not batches:
+        return ARROW_SCHEMA.empty_table()
+    # older datasets store the dictionary columns as plain strings; cast brings them to ARROW_SCHEMA
+    table = pa.Table.from_batches(batches).cast(ARROW_SCHEMA)
+    if reordered:
+        table = table.take(np.argsort(ts_us(table), kind="stable"))
+    return table
+
+
+def read_direction(fs: pafs.FileSystem, paths: List[str]) -> pa.Table:
+    """Read one direction of a day, part by part, into a single (chunked) table with the generator's schema."""
+    parts = [read_part(fs, list(files)) for _, files in groupby(paths, key=part_number)]
+    if not parts:
+        return ARROW_SCHEMA.empty_table()
+    return pa.concat_tables(parts).unify_dictionaries()
+
+
+def day_slices(day: date, incoming: pa.Table, outgoing: pa.Table, chunk_rows: int) -> Iterator[DaySlice]:
+    """Cut a day into DaySlices of at most chunk_rows rows per direction (zero-copy)."""
+    parts = max(-(-max(incoming.num_rows, outgoing.num_rows) // chunk_rows), 1)
+    for part in range(parts):
+        yield DaySlice(
+            day,
+            incoming.slice(part * chunk_rows, chunk_rows),
+            outgoing.slice(part * chunk_rows, chunk_rows),
+            part=part,
+            last=part == parts - 1,
+        )
+
+
+def replay_slices(
+    fs: pafs.FileSystem,
+    days: Dict[date, Dict[str, List[str]]],
+    workers: int,
+    chunk_rows: int,
+    metrics: StageMetrics,
+) -> Iterator[Tuple[DaySlice, float]]:
+    """
+    Yield (slice, read_seconds) for every day in order. Up to `workers` days are read
+    concurrently ahead of the writers; a day's read time is reported on its first slice.
+    """
+
+    def read_day(day: date, files: Dict[str, List[str]]) -> Tuple[pa.Table, pa.Table, float]:
+        t0 = time.perf_counter()
+        rss0 = peak_rss_bytes()
+        incoming, outgoing = (read_direction(fs, files[d]) for d in DIRECTIONS)
+        elapsed = time.perf_counter() - t0
+        rows = incoming.num_rows + outgoing.num_rows
+        nbytes = frame_nbytes(incoming) + frame_nbytes(outgoing)
+        metrics.add(day, "read", elapsed, rows, nbytes, rss_growth(rss0))
+        return incoming, outgoing, elapsed
+
+    todo = iter(days.items())
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replay-read") as pool:
+        pending = deque()
+        for day, files in todo:
+            pending.append((day, pool.submit(read_day, day, files)))
+            if len(pending) == workers:
+                break
+        while pending:
+            day, future = pending.popleft()
+            incoming, outgoing, elapsed = future.result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append((nxt[0], pool.submit(read_day, *nxt)))
+            for piece in day_slices(day, incoming, outgoing, chunk_rows):
+                yield piece, elapsed if piece.part == 0 else 0.0
+
+
+def main():
+    ap = argparse.ArgumentParser(
+        description="Replay an existing vehicles Parquet dataset into the generate_vehicles.py sinks"
+    )
+    ap.add_argument(
+        "--source",
+        type=str,
+        required=True,
+        help="dataset root (contains direction=*/date=*): a local directory or s3://bucket/prefix",
+    )
+    ap.add_argument("--start-date", type=str, default=None, help="first day to replay, YYYY-MM-DD")
+    ap.add_argument("--end-date", type=str, default=None, help="last day to replay (inclusive), YYYY-MM-DD")
+    ap.add_argument("--workers", type=int, default=4, help="days read concurrently ahead of the writers")
+    ap.add_argument("--chunk-rows", type=int, default=250_000)
+    ap.add_argument("--queue-depth", type=int, default=2, help="max slices buffered per writer (caps memory)")
+    add_sink_args(ap)
+    ap.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="JSON-lines checkpoint of completed (day, direction, sink); rerun with the same file to resume",
+    )
+
+    args = ap.parse_args()
+    if args.workers <= 0:
+        ap.error("--workers must be > 0")
+    if args.queue_depth <= 0:
+        ap.error("--queue-depth must be > 0")
+    check_sink_args(ap, args)
+
+    fs, root = open_source(args)
+    if "localfs" in args.sink and isinstance(fs, pafs.LocalFileSystem) and root == os.path.abspath(args.local_dir):
+        ap.error("--source and --local-dir are the same dataset")
+    if "s3" in args.sink and args.source.startswith("s3://"):
+        cfg = s3_config(args)
+        if root == f"{cfg.bucket}/{cfg.prefix}":
+            ap.error("--source and the S3 sink are the same dataset")
+
+    days = list_day_files(fs, root)
+    if args.start_date:
+        days = {d: f for d, f in days.items() if d >= date.fromisoformat(args.start_date)}
+    if args.end_date:
+        days = {d: f for d, f in days.items() if d <= date.fromisoformat(args.end_date)}
+    if not days:
+        raise SystemExit(f"no direction=*/date=* parquet parts under {args.source}")
+    print(f"Replaying {len(days)} day(s) from {args.source}", flush=True)
+
+    metrics = StageMetrics()
+    sinks = open_sinks(args, args.chunk_rows, metrics)
+    writers = sinks.writers
+    manifest = None
+    if args.manifest:
+        params = {"source": args.source, "start_date": args.start_date, "end_date": args.end_date}
+        params.update({name: getattr(args, name) for name in ("chunk_rows",) + LAYOUT_PARAMS})
+        try:
+            manifest = DayManifest(args.manifest, params)
+        except ValueError as exc:
+            sinks.close()
+            ap.error(str(exc))
+        writers, todo = resume_from_manifest(manifest, sinks, list(days))
+        if len(todo) < len(days):
+            print(f"Resuming from {args.manifest}: {len(days) - len(todo)} day(s) already complete", flush=True)
+        days = {d: days[d] for d in todo}
+
+    bytes_total = {name: 0 for name in writers}
+    rows_total = 0
+
+    def report_day(day: date, n_in: int, n_out: int, read_elapsed: float, timings, volumes):
+        nonlocal rows_total
+        rows_total += n_in + n_out
+        line = f"{day} incoming={n_in:,} outgoing={n_out:,} read={read_elapsed:.2f}s"
+        for name, seconds in timings.items():
+            bytes_total[name] += volumes[name]
+            line += f" {name}={seconds:.2f}s"
+        print(line, flush=True)
+        metrics.pop_day(day)
+
+    run_start = time.perf_counter()
+    slices = replay_slices(fs, days, args.workers, args.chunk_rows, metrics)
+    busy = run_pipeline(slices, writers, args.queue_depth, report_day)
+    wall = time.perf_counter() - run_start
+    sinks.close()
+    if manifest is not None:
+        manifest.close()
+
+    print("\n--- replay timings (informational only) ---", flush=True)
+    print(f"Total wall time: {wall:.2f}s for {rows_total:,} rows", flush=True)
+    print(f"Read total ({args.workers} worker(s)): {busy['gen']:.2f}s", flush=True)
+    for name in writers:
+        print(
+            f"{name}: {busy[name]:.2f}s ({bytes_total[name] / 1e6:,.1f} MB, "
+            f"{mb_per_s(bytes_total[name], busy[name]):.1f} MB/s)",
+            flush=True,
+        )
+    print_stage_summary(metrics.summary())
+
+
+if __name__ == "__main__":
+    main()